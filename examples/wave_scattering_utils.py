@@ -6,6 +6,7 @@ import logging
 from timeit import default_timer
 
 import jax.numpy as jnp
+import numpy as np
 import jax
 import h5py
 
@@ -115,14 +116,40 @@ def setup_scattering_lin_system(
     Returns:
         Tuple[jnp.array, jnp.array]: A, which has shape (n, n) and b, which has shape (n, n_sources).
     """
-    n_bdry_pts = gauss_bdry_pts.shape[0]
-
     # T_int = get_DtN_from_ItI(R, eta)
 
     uin, normals = get_uin_and_normals(k, gauss_bdry_pts, source_directions)
 
+    return setup_scattering_lin_system_from_uin(S, D, T_int, uin, normals)
+
+
+@jax.jit
+def setup_scattering_lin_system_from_uin(
+    S: jnp.array,
+    D: jnp.array,
+    T_int: jnp.array,
+    uin: jnp.array,
+    uin_dn: jnp.array,
+) -> Tuple[jnp.array, jnp.array]:
+    """
+    Same as setup_scattering_lin_system, but takes the incoming wave and its
+    normal derivative on the boundary as inputs so they can be reused by the
+    caller.
+
+    Args:
+        S (jnp.array): Single-layer potential matrix. Has shape (n,n)
+        D (jnp.array): Double-layer potential matrix. Has shape (n,n)
+        T_int (jnp.array): Dirichlet-to-Neumann matrix. Has shape (n,n)
+        uin (jnp.array): Incoming wave on the boundary. Has shape (n, n_sources)
+        uin_dn (jnp.array): Outward normal derivative of the incoming wave on the boundary. Has shape (n, n_sources)
+
+    Returns:
+        Tuple[jnp.array, jnp.array]: A, which has shape (n, n) and b, which has shape (n, n_sources).
+    """
+    n_bdry_pts = uin.shape[0]
+
     A = 0.5 * jnp.eye(n_bdry_pts) - D + S @ T_int
-    b = S @ (normals - T_int @ uin)
+    b = S @ (uin_dn - T_int @ uin)
 
     return A, b
 
@@ -149,32 +176,19 @@ def get_uin_and_normals(
     """
     n_per_side = bdry_pts.shape[0] // 4
 
-    uin = get_uin(k, bdry_pts, source_directions)
+    source_vecs = _make_source_vecs(source_directions)
+    uin = _get_uin_from_source_vecs(k, bdry_pts, source_vecs)
     # print("get_uin_and_normals: uin shape: ", uin.shape)
-    source_vecs = jnp.array(
-        [jnp.cos(source_directions), jnp.sin(source_directions)]
-    ).T
     # print("get_uin_and_normals: source_vecs shape: ", source_vecs.shape)
 
-    normals = jnp.concatenate(
-        [
-            -1j
-            * k
-            * jnp.expand_dims(source_vecs[:, 1], axis=0)
-            * uin[:n_per_side],  # -1 duin/dy
-            1j
-            * k
-            * jnp.expand_dims(source_vecs[:, 0], axis=0)
-            * uin[n_per_side : 2 * n_per_side],  # duin/dx
-            1j
-            * k
-            * jnp.expand_dims(source_vecs[:, 1], axis=0)
-            * uin[2 * n_per_side : 3 * n_per_side],  # duin/dy
-            -1j
-            * k
-            * jnp.expand_dims(source_vecs[:, 0], axis=0)
-            * uin[3 * n_per_side :],
-        ]
+    # Going around the boundary counter-clockwise, the outward normal
+    # derivatives on the four sides are -duin/dy, duin/dx, duin/dy, -duin/dx,
+    # and d uin / dx_j = ik s_j uin. Build the sign and the component of s for
+    # every boundary point and form all of the normals in one expression.
+    side_signs = jnp.repeat(jnp.array([-1.0, 1.0, 1.0, -1.0]), n_per_side)
+    side_axes = jnp.repeat(jnp.array([1, 0, 1, 0]), n_per_side)
+    normals = (
+        (1j * k) * side_signs[:, None] * source_vecs[:, side_axes].T * uin
     )
 
     # Plot the normals
@@ -190,12 +204,33 @@ def get_uin_and_normals(
 def get_uin(
     k: float, pts: jnp.array, source_directions: jnp.array
 ) -> jnp.array:
-    source_vecs = jnp.array(
-        [jnp.cos(source_directions), jnp.sin(source_directions)]
-    ).T
+    source_vecs = _make_source_vecs(source_directions)
     # jax.debug.print("get_uin: source_vecs: {x}", x=source_vecs)
-    uin = jnp.exp(1j * k * jnp.dot(pts, source_vecs.T))
-    return uin
+    return _get_uin_from_source_vecs(k, pts, source_vecs)
+
+
+@jax.jit
+def _make_source_vecs(source_directions: jnp.array) -> jnp.array:
+    """
+    Unit vectors s = (cos(theta), sin(theta)) for each incoming plane wave.
+
+    Args:
+        source_directions (jnp.array): Has shape (n_sources,). Directions in radians.
+
+    Returns:
+        jnp.array: Has shape (n_sources, 2)
+    """
+    return jnp.stack(
+        [jnp.cos(source_directions), jnp.sin(source_directions)], axis=-1
+    )
+
+
+@jax.jit
+def _get_uin_from_source_vecs(
+    k: float, pts: jnp.array, source_vecs: jnp.array
+) -> jnp.array:
+    """uin(x) = exp(i k <x,s>) for each point x and each source vector s."""
+    return jnp.exp(1j * k * jnp.dot(pts, source_vecs.T))
 
 
 @jax.jit
@@ -208,15 +243,16 @@ def get_scattering_uscat_impedance(
     k: float,
     eta: float,
 ) -> jnp.array:
-    A, b = setup_scattering_lin_system(
+    # The incoming wave is computed once and used both to set up the
+    # linear system and to recover the scattered field's normal derivative.
+    uin, uin_dn = get_uin_and_normals(k, bdry_pts, source_dirs)
+    A, b = setup_scattering_lin_system_from_uin(
         S=S,
         D=D,
         T_int=T,
-        gauss_bdry_pts=bdry_pts,
-        k=k,
-        source_directions=source_dirs,
+        uin=uin,
+        uin_dn=uin_dn,
     )
-    uin, uin_dn = get_uin_and_normals(k, bdry_pts, source_dirs)
 
     # logging.debug(
     #     "get_scattering_uscat_impedance: A shape: %s, b shape: %s, uin shape: %s, uin_dn shape: %s",
@@ -238,6 +274,34 @@ def get_scattering_uscat_impedance(
     return imp
 
 
+@jax.jit
+def _get_i_term_and_source(
+    k: float,
+    q_evals: jnp.array,
+    pts: jnp.array,
+    source_directions: jnp.array,
+) -> Tuple[jnp.array, jnp.array]:
+    """
+    Evaluates the zeroth-order coefficient k^2 (1 + q) and the source term
+    -k^2 q uin of the scattering problem in a single jitted region, so the
+    elementwise work fuses and no intermediates are written out.
+
+    Args:
+        k (float): Frequency of the incoming plane waves
+        q_evals (jnp.array): Scattering potential evaluated at pts. Has shape (n_leaves, p**2)
+        pts (jnp.array): Has shape (n_leaves, p**2, 2)
+        source_directions (jnp.array): Has shape (n_sources,). Describes the direction of the incoming plane waves in radians.
+
+    Returns:
+        Tuple[jnp.array, jnp.array]: i_term, which has shape (n_leaves, p**2) and source_term, which has shape (n_leaves, p**2, n_sources).
+    """
+    k_sq = k**2
+    uin_evals = get_uin(k, pts, source_directions)
+    i_term = k_sq * (1 + q_evals)
+    source_term = (-k_sq) * q_evals[..., None] * uin_evals
+    return i_term, source_term
+
+
 # Not optimized.
 INTERP_BATCH_SIZE = 20
 
@@ -293,14 +357,11 @@ def solve_scattering_problem(
     # Evaluate the coefficients and source term for the wave scattering problem
     d_xx_coeffs = jnp.ones_like(domain.interior_points[:, :, 0])
     d_yy_coeffs = jnp.ones_like(domain.interior_points[:, :, 0])
-    i_term = k**2 * (1 + q_fn(domain.interior_points))
-    logging.debug("solve_scattering_problem: i_term shape: %s", i_term.shape)
-
-    uin_evals = get_uin(k, domain.interior_points, source_dirs)
-
-    source_term = (
-        -1 * (k**2) * q_fn(domain.interior_points)[..., None] * uin_evals
+    q_evals = q_fn(domain.interior_points)
+    i_term, source_term = _get_i_term_and_source(
+        k, q_evals, domain.interior_points, source_dirs
     )
+    logging.debug("solve_scattering_problem: i_term shape: %s", i_term.shape)
     logging.debug(
         "solve_scattering_problem: source_term shape: %s", source_term.shape
     )
@@ -368,13 +429,6 @@ def solve_scattering_problem(
         eta=k,
     )
 
-    # Delete exterior matrices we no longer need
-    T_ItI.delete()
-    T_DtN.delete()
-    if bool_delete_SD:
-        S.delete()
-        D.delete()
-
     # Propagate the resulting impedance data down to the leaves
     if bool_use_recomp:
         uscat_soln = downward_pass_subtree(
@@ -395,6 +449,15 @@ def solve_scattering_problem(
             host_device=jax.devices()[0],
         )
 
+    # Delete exterior matrices we no longer need. This is done after the
+    # downward pass has been dispatched so the host does not wait on the
+    # boundary integral solve before queueing the downward pass.
+    T_ItI.delete()
+    T_DtN.delete()
+    if bool_delete_SD:
+        S.delete()
+        D.delete()
+
     # Interpolate the solution onto a regular grid with n points per dimension
 
     logging.info(
@@ -405,33 +468,35 @@ def solve_scattering_problem(
 
     n_src = source_dirs.shape[0]
 
-    uscat_regular = jnp.zeros(
-        (n, n, n_src), dtype=jnp.complex128, device=jax.devices("cpu")[0]
+    # Do the interpolation from HPS to regular grid in batches of size
+    # INTERP_BATCH_SIZE along the source dimension. Each batch is moved to
+    # the host as soon as it is computed, so the device only holds one batch
+    # of the regular-grid solution at a time. Looping over the batches on the
+    # device with jax.lax.map would keep the whole solution there.
+    logging.debug(
+        "solve_scattering_problem: Interpolating %s sources. uscat_soln.devices()=%s",
+        n_src,
+        uscat_soln.devices(),
     )
-
-    # Do the interpolation from HPS to regular grid in batches of size INTERP_BATCH_SIZE
-    # along the source dimension
-    for i in range(0, n_src, INTERP_BATCH_SIZE):
-        chunk_start = i
-        chunk_end = min((i + INTERP_BATCH_SIZE), n_src)
-        logging.debug(
-            "solve_scattering_problem: Interpolating chunk i=%s, %s:%s",
-            i,
-            chunk_start,
-            chunk_end,
+    # The batches are written into a preallocated host buffer, so the full
+    # (n, n, n_src) solution is only allocated once.
+    uscat_regular_np = np.empty((n, n, n_src), dtype=uscat_soln.dtype)
+    for chunk_start in range(0, n_src, INTERP_BATCH_SIZE):
+        chunk_end = min(chunk_start + INTERP_BATCH_SIZE, n_src)
+        chunk_i, _ = domain.interp_from_interior_points(
+            samples=uscat_soln[..., chunk_start:chunk_end],
+            eval_points_x=xvals_reg,
+            eval_points_y=yvals_reg,
         )
-        uscat_i = uscat_soln[..., chunk_start:chunk_end]
-        logging.debug(
-            "solve_scattering_problem: uscat_i.devices()=%s", uscat_i.devices()
-        )
-        chunk_i, target_pts = domain.interp_from_interior_points(
-            samples=uscat_i, eval_points_x=xvals_reg, eval_points_y=yvals_reg
+        uscat_regular_np[..., chunk_start:chunk_end] = np.asarray(
+            jax.device_get(chunk_i)
         )
+        del chunk_i
+    uscat_regular = jax.device_put(uscat_regular_np, jax.devices("cpu")[0])
 
-        chunk_i = jax.device_put(chunk_i, jax.devices("cpu")[0])
-        uscat_regular = uscat_regular.at[..., chunk_start:chunk_end].set(
-            chunk_i
-        )
+    # The target points do not depend on the samples.
+    X, Y = jnp.meshgrid(xvals_reg, yvals_reg)
+    target_pts = jnp.stack([X, Y], axis=-1)
 
     uscat_regular.block_until_ready()
 
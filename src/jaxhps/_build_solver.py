@@ -1,6 +1,8 @@
 import logging
 import jax
 import jax.numpy as jnp
+from functools import partial
+from typing import Tuple
 
 from ._pdeproblem import PDEProblem, _get_PDEProblem_chunk
 
@@ -116,12 +118,8 @@ def build_solver(
     # Determine if batching is necessary.
     chunksize = chunksize_fn(pde_problem.domain.p, pde_problem.source.dtype)
     if chunksize < pde_problem.domain.n_leaves:
-        # Do the local solve stage in batches.
-        Y_arr_lst = []
-        T_arr_lst = []
-        v_lst = []
-        h_lst = []
-
+        # Do the local solve stage in batches. Each chunk's (Y, T, v, h) is
+        # written directly into preallocated output arrays.
         for start_idx in range(0, pde_problem.domain.n_leaves, chunksize):
             end_idx = min(start_idx + chunksize, pde_problem.domain.n_leaves)
 
@@ -133,35 +131,38 @@ def build_solver(
                 "build_solver: chunk_i.source.shape = %s", chunk_i.source.shape
             )
             # Perform the local solve stage on the chunk
-            Y_arr_chunk, T_arr_chunk, v_chunk, h_chunk = local_solve_fn(
+            chunk_out = local_solve_fn(
                 pde_problem=chunk_i,
                 device=compute_device,
                 host_device=host_device,
             )
-            Y_arr_lst.append(Y_arr_chunk)
-            T_arr_lst.append(T_arr_chunk)
-            v_lst.append(v_chunk)
-            h_lst.append(h_chunk)
-
-        # Concatenate the results from all chunks
-        Y_arr_host = jnp.concatenate(Y_arr_lst, axis=0)
-        T_arr_host = jnp.concatenate(T_arr_lst, axis=0)
-        v_host = jnp.concatenate(v_lst, axis=0)
-        h_host = jnp.concatenate(h_lst, axis=0)
+            if start_idx == 0:
+                out = _zeros_for_chunks(
+                    chunk_out, pde_problem.domain.n_leaves, host_device
+                )
+            out = _set_chunks(out, chunk_out, start_idx)
+            del chunk_out
+
+        Y_arr_host, T_arr, v_host, h = out
     else:
-        # Perform the local solve stage all at once for smaller problem sizes
-        Y_arr_host, T_arr_host, v_host, h_host = local_solve_fn(
+        # Perform the local solve stage all at once for smaller problem sizes.
+        # T and h are only consumed by the merge stage, so they stay on the
+        # compute device rather than making a round trip through the host.
+        # Only Y and v are moved to host_device.
+        Y_arr, T_arr, v, h = local_solve_fn(
             pde_problem=pde_problem,
             device=compute_device,
-            host_device=host_device,
+            host_device=compute_device,
         )
+        Y_arr_host, v_host = jax.device_put((Y_arr, v), host_device)
+        del Y_arr, v
     pde_problem.Y = Y_arr_host
     pde_problem.v = v_host
 
     # Perform the merge stage
     merge_out = merge_fn(
-        T_arr_host,
-        h_host,
+        T_arr,
+        h,
         l=pde_problem.domain.L,
         device=compute_device,
         host_device=host_device,
@@ -206,10 +207,6 @@ def _adaptive_build_solver(
     else:
         # We will need to break this problem into chunks if it is large.
         chunksize = local_solve_chunksize_3D(pde_problem.domain.p, jnp.float64)
-        Y_arr_lst = []
-        T_arr_lst = []
-        v_lst = []
-        h_lst = []
         for start_idx in range(0, pde_problem.domain.n_leaves, chunksize):
             end_idx = min(start_idx + chunksize, pde_problem.domain.n_leaves)
             # Get a chunk of the PDEProblem
@@ -220,23 +217,19 @@ def _adaptive_build_solver(
                 "build_solver: chunk_i.source.shape = %s", chunk_i.source.shape
             )
             # Perform the local solve stage on the chunk
-            Y_arr_chunk, T_arr_chunk, v_chunk, h_chunk = (
-                local_solve_stage_adaptive_3D_DtN(
-                    pde_problem=chunk_i,
-                    device=compute_device,
-                    host_device=host_device,
-                )
+            chunk_out = local_solve_stage_adaptive_3D_DtN(
+                pde_problem=chunk_i,
+                device=compute_device,
+                host_device=host_device,
             )
-            Y_arr_lst.append(Y_arr_chunk)
-            T_arr_lst.append(T_arr_chunk)
-            v_lst.append(v_chunk)
-            h_lst.append(h_chunk)
+            if start_idx == 0:
+                out = _zeros_for_chunks(
+                    chunk_out, pde_problem.domain.n_leaves, host_device
+                )
+            out = _set_chunks(out, chunk_out, start_idx)
+            del chunk_out
 
-        # Concatenate the results from all chunks
-        Y_arr_host = jnp.concatenate(Y_arr_lst, axis=0)
-        T_arr_host = jnp.concatenate(T_arr_lst, axis=0)
-        v_host = jnp.concatenate(v_lst, axis=0)
-        h_host = jnp.concatenate(h_lst, axis=0)
+        Y_arr_host, T_arr_host, v_host, h_host = out
 
         # Need to set all Y, T, v, h attributes in the leaves
         leaves = get_all_leaves(pde_problem.domain.root)
@@ -275,10 +268,8 @@ def _nosource_build_solver(
         local_solve_fn = nosource_local_solve_stage_uniform_2D_DtN
         merge_fn = nosource_merge_stage_uniform_2D_DtN
     if chunksize < pde_problem.domain.n_leaves:
-        # Do the local solve stage in batches.
-        Y_arr_lst = []
-        T_arr_lst = []
-
+        # Do the local solve stage in batches. Each chunk's (Y, T, Phi) is
+        # written directly into preallocated output arrays.
         for start_idx in range(0, pde_problem.domain.n_leaves, chunksize):
             end_idx = min(start_idx + chunksize, pde_problem.domain.n_leaves)
 
@@ -287,22 +278,22 @@ def _nosource_build_solver(
                 pde_problem=pde_problem, start_idx=start_idx, end_idx=end_idx
             )
             logging.debug(
-                "build_solver: chunk_i.source.shape = %s", chunk_i.source.shape
+                "build_solver: chunk from %s to %s", start_idx, end_idx
             )
             # Perform the local solve stage on the chunk
-            Y_arr_chunk, T_arr_chunk = local_solve_fn(
+            chunk_out = local_solve_fn(
                 pde_problem=chunk_i,
                 device=compute_device,
                 host_device=host_device,
             )
-            Y_arr_lst.append(Y_arr_chunk)
-            T_arr_lst.append(T_arr_chunk)
-
-        # Concatenate the results from all chunks
-        Y_arr_host = jnp.concatenate(Y_arr_lst, axis=0)
-        T_arr_host = jnp.concatenate(T_arr_lst, axis=0)
-        # v_host = jnp.concatenate(v_lst, axis=0)
-        # h_host = jnp.concatenate(h_lst, axis=0)
+            if start_idx == 0:
+                out = _zeros_for_chunks(
+                    chunk_out, pde_problem.domain.n_leaves, host_device
+                )
+            out = _set_chunks(out, chunk_out, start_idx)
+            del chunk_out
+
+        Y_arr_host, T_arr_host, Phi_arr_host = out
     else:
         # Perform the local solve stage all at once for smaller problem sizes
         Y_arr_host, T_arr_host, Phi_arr_host = local_solve_fn(
@@ -329,3 +320,49 @@ def _nosource_build_solver(
         return merge_out[3]
     else:
         return None
+
+
+def _zeros_for_chunks(
+    chunk_out: Tuple[jax.Array, ...], n_leaves: int, device: jax.Device
+) -> Tuple[jax.Array, ...]:
+    """
+    Allocates zero-filled output arrays with room for all n_leaves leaves,
+    matching the trailing shapes and dtypes of one chunk's outputs.
+
+    Args:
+        chunk_out (Tuple[jax.Array, ...]): The outputs of the local solve stage for one chunk.
+        n_leaves (int): Total number of leaves.
+        device (jax.Device): Where to allocate the output arrays.
+
+    Returns:
+        Tuple[jax.Array, ...]: Zero arrays with leading dimension n_leaves.
+    """
+    return tuple(
+        jnp.zeros((n_leaves,) + x.shape[1:], dtype=x.dtype, device=device)
+        for x in chunk_out
+    )
+
+
+@partial(jax.jit, donate_argnums=(0,))
+def _set_chunks(
+    out: Tuple[jax.Array, ...],
+    chunk_out: Tuple[jax.Array, ...],
+    start_idx: int,
+) -> Tuple[jax.Array, ...]:
+    """
+    Writes one chunk's local solve outputs into the full output arrays along
+    the leaf axis. The buffers of out are donated, so the update is done in
+    place rather than concatenating all of the chunks at the end.
+
+    Args:
+        out (Tuple[jax.Array, ...]): The full output arrays.
+        chunk_out (Tuple[jax.Array, ...]): The outputs for one chunk.
+        start_idx (int): Index of the first leaf in the chunk.
+
+    Returns:
+        Tuple[jax.Array, ...]: The updated output arrays.
+    """
+    return tuple(
+        jax.lax.dynamic_update_slice_in_dim(o, c, start_idx, axis=0)
+        for o, c in zip(out, chunk_out)
+    )
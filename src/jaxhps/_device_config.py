@@ -1,4 +1,5 @@
 import logging
+import os
 import jax
 import numpy as np
 import jax.numpy as jnp
@@ -26,12 +27,31 @@ DEVICE_MESH = jax.sharding.Mesh(DEVICE_ARR, axis_names=("x",))
 #: The CPU device. Not used for computation but is often used for storing data that needs to be moved off the GPU.
 HOST_DEVICE = jax.devices("cpu")[0]
 
+#: Name of the environment variable used to scale the 2D local solve chunksize.
+#: Must be a power of four. Larger chunks amortize per-chunk dispatch and keep
+#: the device busy on large, memory-bound problems, at the cost of a larger
+#: peak memory footprint.
+CHUNKSIZE_MULTIPLIER_ENV_VAR = "JAXHPS_CHUNKSIZE_MULTIPLIER"
+
+
+def _chunksize_multiplier() -> int:
+    """Reads the chunksize multiplier from the environment. Defaults to 1."""
+    val = int(os.environ.get(CHUNKSIZE_MULTIPLIER_ENV_VAR, "1"))
+    # Check that val is a positive power of four
+    if val < 1 or (val & (val - 1)) or (val.bit_length() - 1) % 2:
+        raise ValueError(
+            f"{CHUNKSIZE_MULTIPLIER_ENV_VAR} must be a power of four, got {val}"
+        )
+    return val
+
 
 def local_solve_chunksize_2D(p: int, dtype: jax.typing.DTypeLike) -> int:
     """
     Estimates the chunksize that can be used for the local solve stage in 2D probelms.
 
-    Rounds to the nearest power of four that will fit on the device.
+    Rounds to the nearest power of four that will fit on the device. The
+    result is scaled by the ``JAXHPS_CHUNKSIZE_MULTIPLIER`` environment
+    variable, if it is set.
 
     Args:
         p (int): Chebyshev polynomial order.
@@ -44,12 +64,13 @@ def local_solve_chunksize_2D(p: int, dtype: jax.typing.DTypeLike) -> int:
     """
 
     if p == 7:
-        return 4**2
-
-    if dtype == jnp.complex128:
-        return 4**6
+        chunksize = 4**2
+    elif dtype == jnp.complex128:
+        chunksize = 4**6
+    else:
+        chunksize = 4**7
 
-    return 4**7
+    return chunksize * _chunksize_multiplier()
 
 
 def local_solve_chunksize_3D(p: int, dtype: jax.typing.DTypeLike) -> int:
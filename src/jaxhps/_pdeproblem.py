@@ -1,3 +1,5 @@
+from functools import partial
+
 import jax
 import jax.numpy as jnp
 from ._domain import Domain
@@ -233,6 +235,39 @@ class PDEProblem:
         ] = []  #: (jax.Array) Stores pre-computed BD^{-1} operators for the upward pass.
         self.Phi: jax.Array = None  #: (jax.Array) Stores pre-computed particular solution operators.
 
+        # Stacked differential operators used by the uniform local solves.
+        # Built lazily by _get_stacked_diff_ops().
+        self._stacked_diff_ops: jax.Array | None = None
+
+    def _get_stacked_diff_ops(self) -> jax.Array:
+        """
+        Returns the precomputed differential operators stacked into a single
+        array, in the same order as the coefficients gathered by
+        _gather_coeffs_2D or _gather_coeffs_3D. The last entry is the identity.
+        The stack is built on the first call and reused afterwards.
+
+        Returns:
+            jax.Array: Has shape (6, p**2, p**2) in 2D or (10, p**3, p**3) in 3D.
+        """
+        if getattr(self, "_stacked_diff_ops", None) is None:
+            if self.domain.bool_2D:
+                ops = [self.D_xx, self.D_xy, self.D_yy, self.D_x, self.D_y]
+            else:
+                ops = [
+                    self.D_xx,
+                    self.D_xy,
+                    self.D_yy,
+                    self.D_xz,
+                    self.D_yz,
+                    self.D_zz,
+                    self.D_x,
+                    self.D_y,
+                    self.D_z,
+                ]
+            eye = jnp.eye(self.D_xx.shape[0], dtype=self.D_xx.dtype)
+            self._stacked_diff_ops = jnp.stack(ops + [eye])
+        return self._stacked_diff_ops
+
     def reset(self) -> None:
         """
         Resets the stored solution operators.
@@ -333,6 +368,23 @@ class PDEProblem:
             self.I_coefficients = I_coefficients
 
 
+# Attributes of PDEProblem which are defined on each leaf, and are sliced
+# along the first axis by _get_PDEProblem_chunk.
+_LEAF_DATA_ATTRIBUTES = (
+    "D_xx_coefficients",
+    "D_xy_coefficients",
+    "D_xz_coefficients",
+    "D_yy_coefficients",
+    "D_yz_coefficients",
+    "D_zz_coefficients",
+    "D_x_coefficients",
+    "D_y_coefficients",
+    "D_z_coefficients",
+    "I_coefficients",
+    "source",
+)
+
+
 def _get_PDEProblem_chunk(
     pde_problem: PDEProblem, start_idx: int, end_idx: int
 ) -> PDEProblem:
@@ -376,6 +428,10 @@ def _get_PDEProblem_chunk(
         new_pde_problem.D_xz = pde_problem.D_xz
         new_pde_problem.D_zz = pde_problem.D_zz
 
+    # Share the stacked differential operators between all of the chunks.
+    if pde_problem.domain.bool_uniform:
+        new_pde_problem._stacked_diff_ops = pde_problem._get_stacked_diff_ops()
+
     # Copy the interpolation operators
     if pde_problem.use_ItI:
         # 2D uniform ItI case
@@ -392,6 +448,9 @@ def _get_PDEProblem_chunk(
             if not pde_problem.domain.bool_uniform:
                 new_pde_problem.L_2f1 = pde_problem.L_2f1
                 new_pde_problem.L_1f2 = pde_problem.L_1f2
+                new_pde_problem.sidelens = pde_problem.sidelens[
+                    start_idx:end_idx
+                ]
         else:
             # 3D DtN case
             new_pde_problem.P = pde_problem.P
@@ -404,68 +463,51 @@ def _get_PDEProblem_chunk(
                     start_idx:end_idx
                 ]
 
-    # Copy slices of the coefficients and source terms
-    new_pde_problem.D_xx_coefficients = (
-        pde_problem.D_xx_coefficients[start_idx:end_idx]
-        if pde_problem.D_xx_coefficients is not None
-        else None
-    )
-    new_pde_problem.D_xy_coefficients = (
-        pde_problem.D_xy_coefficients[start_idx:end_idx]
-        if pde_problem.D_xy_coefficients is not None
-        else None
-    )
-    new_pde_problem.D_xz_coefficients = (
-        pde_problem.D_xz_coefficients[start_idx:end_idx]
-        if pde_problem.D_xz_coefficients is not None
-        else None
-    )
-    new_pde_problem.D_yy_coefficients = (
-        pde_problem.D_yy_coefficients[start_idx:end_idx]
-        if pde_problem.D_yy_coefficients is not None
-        else None
-    )
-    new_pde_problem.D_yz_coefficients = (
-        pde_problem.D_yz_coefficients[start_idx:end_idx]
-        if pde_problem.D_yz_coefficients is not None
-        else None
-    )
-    new_pde_problem.D_zz_coefficients = (
-        pde_problem.D_zz_coefficients[start_idx:end_idx]
-        if pde_problem.D_zz_coefficients is not None
-        else None
-    )
-    new_pde_problem.D_x_coefficients = (
-        pde_problem.D_x_coefficients[start_idx:end_idx]
-        if pde_problem.D_x_coefficients is not None
-        else None
-    )
-    new_pde_problem.D_y_coefficients = (
-        pde_problem.D_y_coefficients[start_idx:end_idx]
-        if pde_problem.D_y_coefficients is not None
-        else None
-    )
-    new_pde_problem.D_z_coefficients = (
-        pde_problem.D_z_coefficients[start_idx:end_idx]
-        if pde_problem.D_z_coefficients is not None
-        else None
-    )
-    new_pde_problem.I_coefficients = (
-        pde_problem.I_coefficients[start_idx:end_idx]
-        if pde_problem.I_coefficients is not None
-        else None
-    )
-    # Source term
-    new_pde_problem.source = (
-        pde_problem.source[start_idx:end_idx]
-        if pde_problem.source is not None
-        else None
+    # Copy slices of the coefficients and source terms. The jax Arrays are
+    # sliced together in one jitted call on the device where they live;
+    # anything else (e.g. NumPy arrays) is sliced on the host. Entries which
+    # are None are left as None.
+    coeffs = {
+        name: getattr(pde_problem, name) for name in _LEAF_DATA_ATTRIBUTES
+    }
+    jax_coeffs = {
+        name: arr for name, arr in coeffs.items() if isinstance(arr, jax.Array)
+    }
+    coeffs_chunk = {
+        name: arr if arr is None else arr[start_idx:end_idx]
+        for name, arr in coeffs.items()
+        if name not in jax_coeffs
+    }
+    coeffs_chunk.update(
+        _slice_leaf_data(jax_coeffs, start_idx, end_idx - start_idx)
     )
+    for name, arr in coeffs_chunk.items():
+        setattr(new_pde_problem, name, arr)
 
     # Return the new instance
     return new_pde_problem
 
 
+@partial(jax.jit, static_argnums=(2,))
+def _slice_leaf_data(leaf_data: dict, start_idx: int, n: int) -> dict:
+    """
+    Slices every array in leaf_data along the leaves axis. start_idx is
+    traced, so every chunk of the same size shares one compiled program.
+
+    Args:
+        leaf_data (dict): Arrays with leading dimension n_leaves. Entries may be None.
+        start_idx (int): Start idx along the number of leaves axis.
+        n (int): Number of leaves in the slice.
+
+    Returns:
+        dict: Slices of each array, with leading dimension n.
+    """
+    return jax.tree_util.tree_map(
+        lambda x: jax.lax.dynamic_slice_in_dim(x, start_idx, n, axis=0),
+        leaf_data,
+    )
+
+
 def check_input_shapes(
     source: jax.Array,
     use_ItI: bool,
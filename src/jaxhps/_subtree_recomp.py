@@ -1,5 +1,6 @@
 import jax
 import jax.numpy as jnp
+from functools import partial
 from typing import List, Callable
 from ._pdeproblem import PDEProblem, _get_PDEProblem_chunk
 import logging
@@ -72,144 +73,89 @@ def solve_subtree(
         boundary_data = jnp.concatenate(boundary_data)
 
     if pde_problem.use_ItI:
-        # Check whether we need to use recomputation.
-        if (
-            local_solve_chunksize_2D(pde_problem.domain.p, jnp.complex128)
-            >= pde_problem.domain.n_leaves
-        ):
-            return _all_together_ItI(
-                pde_problem,
-                boundary_data,
-                compute_device=compute_device,
-                host_device=host_device,
-            )
-        else:
-            # This is the branch which uses subtree recomputation.
-            S_lst, g_tilde_lst = _local_solve_and_build(
-                pde_problem=pde_problem,
-                boundary_data=None,
-                subtree_height=subtree_height,
-                compute_device=compute_device,
-                host_device=host_device,
-                local_solve_fn=local_solve_stage_uniform_2D_ItI,
-                merge_fn=merge_stage_uniform_2D_ItI,
-                down_pass_fn=down_pass_uniform_2D_ItI,
-            )
-            # Perform a partial down pass
-            bdry_data = down_pass_uniform_2D_ItI(
-                boundary_data,
-                S_lst,
-                g_tilde_lst,
-                device=compute_device,
-                host_device=host_device,
-            )
-
-            # Final local solve + build + down pass
-            return _local_solve_and_build(
-                pde_problem=pde_problem,
-                boundary_data=bdry_data,
-                subtree_height=subtree_height,
-                compute_device=compute_device,
-                host_device=host_device,
-                local_solve_fn=local_solve_stage_uniform_2D_ItI,
-                merge_fn=merge_stage_uniform_2D_ItI,
-                down_pass_fn=down_pass_uniform_2D_ItI,
-            )
-
+        dtype = jnp.complex128
+        local_solve_fn = local_solve_stage_uniform_2D_ItI
+        merge_fn = merge_stage_uniform_2D_ItI
+        down_pass_fn = down_pass_uniform_2D_ItI
     else:
-        # Check whether we need to use recomputation.
-        if (
-            local_solve_chunksize_2D(pde_problem.domain.p, jnp.float64)
-            >= pde_problem.domain.n_leaves
-        ):
-            return _all_together_DtN(
-                pde_problem,
-                boundary_data,
-                compute_device=compute_device,
-                host_device=host_device,
-            )
-
-        else:
-            # This is the branch which uses subtree recomputation.
-            S_lst, g_tilde_lst = _local_solve_and_build(
-                pde_problem=pde_problem,
-                boundary_data=None,
-                subtree_height=subtree_height,
-                compute_device=compute_device,
-                host_device=host_device,
-                local_solve_fn=local_solve_stage_uniform_2D_DtN,
-                merge_fn=merge_stage_uniform_2D_DtN,
-                down_pass_fn=down_pass_uniform_2D_DtN,
-            )
-            # Perform a partial down pass
-            bdry_data = down_pass_uniform_2D_DtN(
-                boundary_data,
-                S_lst,
-                g_tilde_lst,
-                device=compute_device,
-                host_device=host_device,
-            )
-
-            # Final local solve + build + down pass
-            return _local_solve_and_build(
-                pde_problem=pde_problem,
-                boundary_data=bdry_data,
-                subtree_height=subtree_height,
-                compute_device=compute_device,
-                host_device=host_device,
-                local_solve_fn=local_solve_stage_uniform_2D_DtN,
-                merge_fn=merge_stage_uniform_2D_DtN,
-                down_pass_fn=down_pass_uniform_2D_DtN,
-            )
-
+        dtype = jnp.float64
+        local_solve_fn = local_solve_stage_uniform_2D_DtN
+        merge_fn = merge_stage_uniform_2D_DtN
+        down_pass_fn = down_pass_uniform_2D_DtN
+
+    # Check whether we need to use recomputation.
+    if (
+        local_solve_chunksize_2D(pde_problem.domain.p, dtype)
+        >= pde_problem.domain.n_leaves
+    ):
+        return _all_together(
+            pde_problem,
+            boundary_data,
+            local_solve_fn=local_solve_fn,
+            merge_fn=merge_fn,
+            down_pass_fn=down_pass_fn,
+            compute_device=compute_device,
+            host_device=host_device,
+        )
 
-def _all_together_ItI(
-    pde_problem: PDEProblem,
-    boundary_data: jax.Array,
-    compute_device: jax.Device = jax.devices()[0],
-    host_device: jax.Device = jax.devices("cpu")[0],
-) -> jax.Array:
-    # Perform the local solve stage on the whole problem
-    Y, T, v, h = local_solve_stage_uniform_2D_ItI(
+    # This is the branch which uses subtree recomputation.
+    S_lst, g_tilde_lst = _local_solve_and_build(
         pde_problem=pde_problem,
-        device=compute_device,
-        host_device=compute_device,
-    )
-    # Perform the merge stage
-    S_arr, g_tilde_arr = merge_stage_uniform_2D_ItI(
-        T,
-        h,
-        l=pde_problem.domain.L,
-        device=compute_device,
-        host_device=compute_device,
+        boundary_data=None,
+        subtree_height=subtree_height,
+        compute_device=compute_device,
+        host_device=host_device,
+        local_solve_fn=local_solve_fn,
+        merge_fn=merge_fn,
+        down_pass_fn=down_pass_fn,
     )
-    # Perform the down pass
-    solns = down_pass_uniform_2D_ItI(
+    # Perform a partial down pass
+    bdry_data = down_pass_fn(
         boundary_data,
-        S_arr,
-        g_tilde_arr,
-        Y,
-        v,
+        S_lst,
+        g_tilde_lst,
+        Y_arr=None,
+        v_arr=None,
         device=compute_device,
         host_device=host_device,
     )
-    return solns
 
+    # Final local solve + build + down pass
+    return _local_solve_and_build(
+        pde_problem=pde_problem,
+        boundary_data=bdry_data,
+        subtree_height=subtree_height,
+        compute_device=compute_device,
+        host_device=host_device,
+        local_solve_fn=local_solve_fn,
+        merge_fn=merge_fn,
+        down_pass_fn=down_pass_fn,
+    )
 
-def _all_together_DtN(
+
+def _all_together(
     pde_problem: PDEProblem,
     boundary_data: jax.Array,
+    local_solve_fn: Callable,
+    merge_fn: Callable,
+    down_pass_fn: Callable,
     compute_device: jax.Device = jax.devices()[0],
     host_device: jax.Device = jax.devices("cpu")[0],
 ) -> jax.Array:
+    """
+    Runs the local solve, merge, and down pass stages on the whole problem
+    without any recomputation. Used when all of the leaves fit in one chunk.
+    Every intermediate stays on compute_device; only the solution is moved
+    to host_device.
+    """
     # Perform the local solve stage on the whole problem
-    Y, T, v, h = local_solve_stage_uniform_2D_DtN(
+    Y, T, v, h = local_solve_fn(
         pde_problem=pde_problem,
         device=compute_device,
         host_device=compute_device,
     )
     # Perform the merge stage
-    S_arr, g_tilde_arr = merge_stage_uniform_2D_DtN(
+    S_arr, g_tilde_arr = merge_fn(
         T,
         h,
         l=pde_problem.domain.L,
@@ -217,7 +163,7 @@ def _all_together_DtN(
         host_device=compute_device,
     )
     # Perform the down pass
-    solns = down_pass_uniform_2D_DtN(
+    solns = down_pass_fn(
         boundary_data,
         S_arr,
         g_tilde_arr,
@@ -298,13 +244,13 @@ def _local_solve_and_build(
         #     "_local_solve_and_build: S_lst[-1].shape: %s", boundary_data.shape
         # )
 
-        # Now that it's been reshaped, compute the chunksize
-        bdry_data_chunksize = boundary_data.shape[0] // n_chunks
-
-    # For storing the data at the top of the subtrees
-    T_lst = []
-    h_lst = []
-    solns_lst = []
+        # Move the boundary data to the compute device once, and split it
+        # into one block per subtree up front so the loop below only has to
+        # index along the leading axis.
+        boundary_data = jax.device_put(boundary_data, compute_device)
+        boundary_data = boundary_data.reshape(
+            (n_chunks, -1) + boundary_data.shape[1:]
+        )
 
     # Iterate over the chunks
     for i, start_idx in enumerate(range(0, n_leaves, chunk_size)):
@@ -336,8 +282,21 @@ def _local_solve_and_build(
             Y_arr_chunk.delete()
             T_arr_chunk.delete()
 
-            T_lst.append(T_last)
-            h_lst.append(h_last)
+            if i == 0:
+                # Now that the shapes are known, allocate buffers for the
+                # data at the top of every subtree.
+                T_arr = jnp.zeros(
+                    (n_chunks,) + T_last.shape[1:],
+                    dtype=T_last.dtype,
+                    device=compute_device,
+                )
+                h_arr = jnp.zeros(
+                    (n_chunks,) + h_last.shape[1:],
+                    dtype=h_last.dtype,
+                    device=compute_device,
+                )
+            T_arr = _set_chunk(T_arr, T_last, i)
+            h_arr = _set_chunk(h_arr, h_last, i)
 
         else:
             S_lst, g_tilde_lst = merge_out
@@ -348,34 +307,40 @@ def _local_solve_and_build(
             T_arr_chunk.delete()
             h_chunk.delete()
 
-            bdry_data_i = boundary_data[
-                i * bdry_data_chunksize : (i + 1) * bdry_data_chunksize
-            ]
-            bdry_data_i = jax.device_put(bdry_data_i, compute_device)
-            # Perform the down pass
-            solns = down_pass_fn(
+            bdry_data_i = boundary_data[i]
+            # Propagate the boundary data down to the leaves of the subtree.
+            leaf_bdry_data = down_pass_fn(
                 bdry_data_i,
                 S_lst,
                 g_tilde_lst,
-                Y_arr_chunk,
-                v_chunk,
+                None,
+                None,
                 device=compute_device,
                 host_device=compute_device,
             )
-
+            # v_chunk is donated, so the solution is written into its buffer
+            # rather than a fresh allocation.
+            solns = _leaf_solns(Y_arr_chunk, leaf_bdry_data, v_chunk)
+            Y_arr_chunk.delete()
+            # The solution for this chunk is sent to the host device as soon
+            # as it is computed; the transfer is asynchronous, so it overlaps
+            # with the next chunk's local solve and the compute device never
+            # holds the full solution.
+            solns = jax.device_put(solns, host_device)
+
+            if i == 0:
+                # Allocate the output once the shape of the solution is known.
+                solns_out = jnp.zeros(
+                    (n_leaves,) + solns.shape[1:],
+                    dtype=solns.dtype,
+                    device=host_device,
+                )
             # Store the solution
-            solns_lst.append(solns)
+            solns_out = _set_chunk(solns_out, solns, start_idx)
 
-    # At the end, we either concatenate the solutions and return them, or we concatenate the
-    # T and h arrays and do the final upward merges
+    # At the end, we either return the solutions or do the final upward
+    # merges
     if upward_pass:
-        T_arr = jnp.concatenate(T_lst, axis=0)
-        for T in T_lst:
-            T.delete()
-        h_arr = jnp.concatenate(h_lst, axis=0)
-        for h in h_lst:
-            h.delete()
-
         # Perform the final upward merges
         final_merge_out = merge_fn(
             T_arr=T_arr,
@@ -389,7 +354,37 @@ def _local_solve_and_build(
 
         return final_merge_out
     else:
-        return jax.device_put(jnp.concatenate(solns_lst, axis=0), host_device)
+        return solns_out
+
+
+@partial(jax.jit, donate_argnums=(2,))
+def _leaf_solns(
+    Y_arr: jax.Array, leaf_bdry_data: jax.Array, v_arr: jax.Array
+) -> jax.Array:
+    """
+    Maps incoming boundary data to the solution on the interior of each leaf.
+    The buffer of v_arr is donated and reused for the output.
+
+    Args:
+        Y_arr (jax.Array): Has shape (n_leaves, p^2, n_bdry)
+        leaf_bdry_data (jax.Array): Has shape (n_leaves, n_bdry) or (n_leaves, n_bdry, nsrc)
+        v_arr (jax.Array): Has shape (n_leaves, p^2) or (n_leaves, p^2, nsrc)
+
+    Returns:
+        jax.Array: Has the same shape as v_arr.
+    """
+    if leaf_bdry_data.ndim == 3:
+        return jnp.matmul(Y_arr, leaf_bdry_data) + v_arr
+    return jnp.matmul(Y_arr, leaf_bdry_data[..., None])[..., 0] + v_arr
+
+
+@partial(jax.jit, donate_argnums=(0,))
+def _set_chunk(out: jax.Array, chunk: jax.Array, start_idx: int) -> jax.Array:
+    """
+    Writes chunk into out along the leading axis, starting at start_idx.
+    The buffer of out is donated, so the update is done in place.
+    """
+    return jax.lax.dynamic_update_slice_in_dim(out, chunk, start_idx, axis=0)
 
 
 def upward_pass_subtree(
@@ -53,13 +53,10 @@ def down_pass_uniform_2D_DtN(
 
     """
 
-    bdry_data = jax.device_put(boundary_data, device)
-    Y_arr = jax.device_put(Y_arr, device)
-    v_arr = jax.device_put(v_arr, device)
-    S_lst = [jax.device_put(S_arr, device) for S_arr in S_lst]
-    g_tilde_lst = [jax.device_put(g_tilde, device) for g_tilde in g_tilde_lst]
-
-    n_levels = len(S_lst)
+    # Move all of the inputs to the device in one transfer.
+    bdry_data, Y_arr, v_arr, S_lst, g_tilde_lst = jax.device_put(
+        (boundary_data, Y_arr, v_arr, list(S_lst), list(g_tilde_lst)), device
+    )
 
     logging.debug(
         "down_pass_uniform_2D_DtN: shapes of g_tilde_lst: %s",
@@ -83,45 +80,53 @@ def down_pass_uniform_2D_DtN(
         # Reshape to (1, n_bdry, nsrc)
         bdry_data = jnp.expand_dims(bdry_data, axis=-1)
 
-    # propagate the Dirichlet data down the tree using the S maps.
-    for level in range(n_levels - 1, -1, -1):
-        S_arr = S_lst[level]
-        g_tilde = g_tilde_lst[level]
-
-        # Print out the shapes of the arrays
-        logging.debug(
-            "down_pass_uniform_2D_DtN: level %d, S_arr shape: %s, g_tilde shape: %s, bdry_data shape: %s",
-            level,
-            S_arr.shape,
-            g_tilde.shape,
-            bdry_data.shape,
-        )
-
-        bdry_data = vmapped_propagate_down_2D_DtN(S_arr, bdry_data, g_tilde)
-        # Reshape from (-1, 4, n_bdry) to (-1, n_bdry)
-        n_bdry = bdry_data.shape[2]
-        if bool_multi_source:
-            nsrc = bdry_data.shape[-1]
-            bdry_data = bdry_data.reshape((-1, n_bdry, nsrc))
-        else:
-            bdry_data = bdry_data.reshape((-1, n_bdry))
+    # propagate the Dirichlet data down the tree using the S maps. All of the
+    # levels are traced into a single XLA program.
+    bdry_data = _propagate_down_all_levels_2D_DtN(
+        bdry_data, S_lst, g_tilde_lst
+    )
 
     root_incoming_data = bdry_data
 
     if Y_arr is None:
         return root_incoming_data
 
+    # Batched matrix-vector products. Written as a matmul so XLA sees a
+    # dot_general with a batch dimension rather than a general contraction.
     if bool_multi_source:
-        leaf_homog_solns = jnp.einsum(
-            "ijk,ikl->ijl", Y_arr, root_incoming_data
-        )
+        leaf_homog_solns = jnp.matmul(Y_arr, root_incoming_data)
     else:
-        leaf_homog_solns = jnp.einsum("ijk,ik->ij", Y_arr, root_incoming_data)
+        leaf_homog_solns = jnp.matmul(Y_arr, root_incoming_data[..., None])
+        leaf_homog_solns = leaf_homog_solns[..., 0]
     leaf_solns = leaf_homog_solns + v_arr
     leaf_solns = jax.device_put(leaf_solns, host_device)
     return leaf_solns
 
 
+@jax.jit
+def _propagate_down_all_levels_2D_DtN(
+    bdry_data: jax.Array,
+    S_lst: List[jax.Array],
+    g_tilde_lst: List[jax.Array],
+) -> jax.Array:
+    """
+    Propagates boundary data from the root of the quadtree down to the leaves, one level at a time.
+
+    Args:
+        bdry_data (jax.Array): Has shape (1, n_bdry) or (1, n_bdry, nsrc)
+        S_lst (List[jax.Array]): Propagation operators, ordered from the leaves to the root.
+        g_tilde_lst (List[jax.Array]): Incoming particular solution data, ordered from the leaves to the root.
+
+    Returns:
+        jax.Array: Has shape (n_leaves, n_bdry_leaf) or (n_leaves, n_bdry_leaf, nsrc)
+    """
+    for S_arr, g_tilde in zip(reversed(S_lst), reversed(g_tilde_lst)):
+        bdry_data = vmapped_propagate_down_2D_DtN(S_arr, bdry_data, g_tilde)
+        # Reshape from (-1, 4, n_bdry, ...) to (-1, n_bdry, ...)
+        bdry_data = bdry_data.reshape((-1,) + bdry_data.shape[2:])
+    return bdry_data
+
+
 @jax.jit
 def _propagate_down_2D_DtN(
     S_arr: jax.Array,
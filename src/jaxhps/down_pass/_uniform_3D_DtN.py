@@ -59,11 +59,9 @@ def down_pass_uniform_3D_DtN(
     # leaf_Y_maps = jax.device_put(leaf_Y_maps, DEVICE)
     # v_array = jax.device_put(v_array, DEVICE)
 
-    boundary_data = jax.device_put(boundary_data, device)
-    Y_arr = jax.device_put(Y_arr, device)
-    v_arr = jax.device_put(v_arr, device)
-    S_lst = [jax.device_put(S_arr, device) for S_arr in S_lst]
-    g_tilde_lst = [jax.device_put(g_tilde, device) for g_tilde in g_tilde_lst]
+    boundary_data, Y_arr, v_arr, S_lst, g_tilde_lst = jax.device_put(
+        (boundary_data, Y_arr, v_arr, list(S_lst), list(g_tilde_lst)), device
+    )
 
     n_levels = len(S_lst)
 
@@ -103,11 +101,10 @@ def down_pass_uniform_3D_DtN(
     root_dirichlet_data = bdry_data
     # Batched matrix multiplication to compute homog solution on all leaves
     if bool_multi_source:
-        leaf_homog_solns = jnp.einsum(
-            "ijk,ikl->ijl", Y_arr, root_dirichlet_data
-        )
+        leaf_homog_solns = jnp.matmul(Y_arr, root_dirichlet_data)
     else:
-        leaf_homog_solns = jnp.einsum("ijk,ik->ij", Y_arr, root_dirichlet_data)
+        leaf_homog_solns = jnp.matmul(Y_arr, root_dirichlet_data[..., None])
+        leaf_homog_solns = leaf_homog_solns[..., 0]
     leaf_solns = leaf_homog_solns + v_arr
     leaf_solns = jax.device_put(leaf_solns, host_device)
     return leaf_solns
@@ -2,7 +2,6 @@ import jax.numpy as jnp
 import jax
 
 from .._pdeproblem import PDEProblem
-from .._domain import get_all_leaves
 from ._uniform_2D_DtN import _gather_coeffs_2D, get_DtN, assemble_diff_operator
 from .._precompute_operators_2D import precompute_Q_2D_DtN
 from typing import Tuple
@@ -81,11 +80,8 @@ def local_solve_stage_adaptive_2D_DtN(
         device,
     )
     # Have to generate Q matrices for each leaf by re-scaling the differential
-    # operators
-    sidelens = jnp.array(
-        [l.xmax - l.xmin for l in get_all_leaves(pde_problem.domain.root)]
-    )
-    sidelens = jax.device_put(sidelens, device)
+    # operators. The leaf side lengths are precomputed by the PDEProblem.
+    sidelens = jax.device_put(pde_problem.sidelens, device)
 
     all_diff_operators, Q_Ds = (
         vmapped_prep_nonuniform_refinement_diff_operators_2D(
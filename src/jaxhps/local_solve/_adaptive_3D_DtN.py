@@ -5,7 +5,8 @@ from .._pdeproblem import PDEProblem
 
 from typing import Tuple
 from .._precompute_operators_3D import precompute_Q_3D_DtN
-from ._adaptive_2D_DtN import vmapped_get_DtN_adaptive, assemble_diff_operator
+from ._adaptive_2D_DtN import vmapped_get_DtN_adaptive
+from ._uniform_2D_DtN import _scatter_coeffs
 from ._uniform_3D_DtN import _gather_coeffs_3D
 from functools import partial
 
@@ -155,15 +156,27 @@ def _prep_nonuniform_refinement_diff_operators_3D(
         Tuple[jnp.array, jnp.array]: The precomputed differential operators for nonuniform refinement.
     """
     half_side_len = sidelen / 2
-    # Second-order differential operators
-    diff_ops_3D = diff_ops_3D.at[:6].set(diff_ops_3D[:6] / (half_side_len**2))
-    # First-order differential operators
-    diff_ops_3D = diff_ops_3D.at[6:9].set(diff_ops_3D[6:9] / half_side_len)
-    diff_operator = assemble_diff_operator(
-        coeffs_arr, which_coeffs, diff_ops_3D
+    # Rescaling the operators is the same as rescaling the coefficients:
+    # diag(c) (D / s) = diag(c / s) D. Scaling the coefficients avoids
+    # writing a rescaled copy of all 10 (p**3, p**3) operators per leaf.
+    # Second-order operators are scaled by 1 / s**2, first-order operators
+    # by 1 / s, and the identity is left alone.
+    scale = jnp.concatenate(
+        [
+            jnp.full((6,), 1 / (half_side_len**2)),
+            jnp.full((3,), 1 / half_side_len),
+            jnp.ones((1,)),
+        ]
     )
+    coeffs_dense = _scatter_coeffs(coeffs_arr, which_coeffs)
+    coeffs_dense = coeffs_dense * scale[:, None]
+    diff_operator = jnp.sum(coeffs_dense[:, :, None] * diff_ops_3D, axis=0)
     Q_D = precompute_Q_3D_DtN(
-        p, q, diff_ops_3D[6], diff_ops_3D[7], diff_ops_3D[8]
+        p,
+        q,
+        diff_ops_3D[6] / half_side_len,
+        diff_ops_3D[7] / half_side_len,
+        diff_ops_3D[8] / half_side_len,
     )
     return diff_operator, Q_D
 
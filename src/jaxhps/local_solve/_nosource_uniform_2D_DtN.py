@@ -2,7 +2,7 @@ import jax.numpy as jnp
 import jax
 
 from .._pdeproblem import PDEProblem
-from ._uniform_2D_DtN import _gather_coeffs_2D, vmapped_assemble_diff_operator
+from ._uniform_2D_DtN import _gather_coeffs_2D, _assemble_diff_operators
 from typing import Tuple
 
 
@@ -42,34 +42,24 @@ def nosource_local_solve_stage_uniform_2D_DtN(
         D_y_coeffs=pde_problem.D_y_coefficients,
         I_coeffs=pde_problem.I_coefficients,
     )
-    # stack the precomputed differential operators into a single array
-    diff_ops = jnp.stack(
-        [
-            pde_problem.D_xx,
-            pde_problem.D_xy,
-            pde_problem.D_yy,
-            pde_problem.D_x,
-            pde_problem.D_y,
-            jnp.eye(pde_problem.D_xx.shape[0], dtype=jnp.float64),
-        ]
-    )
+    diff_ops = pde_problem._get_stacked_diff_ops()
 
     coeffs_gathered = jax.device_put(
         coeffs_gathered,
         device,
     )
 
-    all_diff_operators = vmapped_assemble_diff_operator(
-        coeffs_gathered, which_coeffs, diff_ops
+    all_diff_operators = _assemble_diff_operators(
+        coeffs_gathered, diff_ops[which_coeffs]
     )
 
     Y_arr, T_arr, Phi_arr = vmapped_get_DtN_nosource(
         all_diff_operators, pde_problem.Q, pde_problem.P
     )
 
-    T_arr_host = jax.device_put(T_arr, host_device)
-    Y_arr_host = jax.device_put(Y_arr, host_device)
-    Phi_arr_host = jax.device_put(Phi_arr, host_device)
+    Y_arr_host, T_arr_host, Phi_arr_host = jax.device_put(
+        (Y_arr, T_arr, Phi_arr), host_device
+    )
     return Y_arr_host, T_arr_host, Phi_arr_host
 
 
@@ -104,18 +94,18 @@ def get_DtN_nosource(
     A_ii_inv = jnp.linalg.inv(A_ii)
     # A_ie shape (n_cheby_int, n_cheby_bdry)
     A_ie = diff_operator[n_cheby_bdry:, :n_cheby_bdry]
-    L_2 = jnp.zeros((diff_operator.shape[0], n_cheby_bdry), dtype=jnp.float64)
-    L_2 = L_2.at[:n_cheby_bdry].set(jnp.eye(n_cheby_bdry))
     soln_operator = -1 * A_ii_inv @ A_ie
-    L_2 = L_2.at[n_cheby_bdry:].set(soln_operator)
-    Y = L_2 @ P
+    # Y = [I; soln_operator] @ P, in the precision of the inputs.
+    Y = jnp.concatenate([P, soln_operator @ P], axis=0)
     T = Q @ Y
 
     return Y, T, A_ii_inv
 
 
-vmapped_get_DtN_nosource = jax.vmap(
-    get_DtN_nosource,
-    in_axes=(0, None, None),
-    out_axes=(0, 0, 0),
+vmapped_get_DtN_nosource = jax.jit(
+    jax.vmap(
+        get_DtN_nosource,
+        in_axes=(0, None, None),
+        out_axes=(0, 0, 0),
+    )
 )
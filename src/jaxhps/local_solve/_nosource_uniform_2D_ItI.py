@@ -2,7 +2,7 @@ import jax.numpy as jnp
 import jax
 
 from .._pdeproblem import PDEProblem
-from ._uniform_2D_DtN import _gather_coeffs_2D, vmapped_assemble_diff_operator
+from ._uniform_2D_DtN import _gather_coeffs_2D, _assemble_diff_operators
 from typing import Tuple
 
 
@@ -42,25 +42,15 @@ def nosource_local_solve_stage_uniform_2D_ItI(
         D_y_coeffs=pde_problem.D_y_coefficients,
         I_coeffs=pde_problem.I_coefficients,
     )
-    # stack the precomputed differential operators into a single array
-    diff_ops = jnp.stack(
-        [
-            pde_problem.D_xx,
-            pde_problem.D_xy,
-            pde_problem.D_yy,
-            pde_problem.D_x,
-            pde_problem.D_y,
-            jnp.eye(pde_problem.D_xx.shape[0], dtype=jnp.float64),
-        ]
-    )
+    diff_ops = pde_problem._get_stacked_diff_ops()
 
     coeffs_gathered = jax.device_put(
         coeffs_gathered,
         device,
     )
 
-    all_diff_operators = vmapped_assemble_diff_operator(
-        coeffs_gathered, which_coeffs, diff_ops
+    all_diff_operators = _assemble_diff_operators(
+        coeffs_gathered, diff_ops[which_coeffs]
     )
 
     R_arr, Y_arr, Phi_arr = vmapped_get_ItI_nosource(
@@ -70,9 +60,9 @@ def nosource_local_solve_stage_uniform_2D_ItI(
         pde_problem.G,
     )
 
-    R_arr_host = jax.device_put(R_arr, host_device)
-    Y_arr_host = jax.device_put(Y_arr, host_device)
-    Phi_arr_host = jax.device_put(Phi_arr, host_device)
+    Y_arr_host, R_arr_host, Phi_arr_host = jax.device_put(
+        (Y_arr, R_arr, Phi_arr), host_device
+    )
 
     return Y_arr_host, R_arr_host, Phi_arr_host
 
@@ -119,28 +109,46 @@ def get_ItI_nosource(
 
     # B has shape (n_cheby_pts, n_cheby_pts). Its top rows are F and its bottom rows are the
     # bottom rows of A.
-    B = jnp.zeros((n_cheby_pts, n_cheby_pts), dtype=jnp.complex128)
-    B = B.at[:n_cheby_bdry_pts].set(G)
-    B = B.at[n_cheby_bdry_pts:].set(A[n_cheby_bdry_pts:])
-    B_inv = jnp.linalg.inv(B)
+    B = jnp.concatenate([G, A[n_cheby_bdry_pts:]], axis=0)
+
+    # Rather than forming inv(B), solve against the two column blocks which
+    # are needed: [P; 0] for Y and the interior columns of the identity for
+    # Phi. This is one factorization of B and no full inverse.
+    n_cheby_int_pts = n_cheby_pts - n_cheby_bdry_pts
+    dtype = jnp.result_type(B, P)
+    rhs = jnp.block(
+        [
+            [
+                P.astype(dtype),
+                jnp.zeros((n_cheby_bdry_pts, n_cheby_int_pts), dtype=dtype),
+            ],
+            [
+                jnp.zeros((n_cheby_int_pts, P.shape[1]), dtype=dtype),
+                jnp.eye(n_cheby_int_pts, dtype=dtype),
+            ],
+        ]
+    )
+    soln = jnp.linalg.solve(B, rhs)
 
     # Y has shape (n_cheby_pts, n_cheby_bdry_pts). It maps from
     # incoming impedance data on the boundary G-L nodes to the
     # homogeneous solution on all of the Cheby nodes.
-    Y = B_inv[:, :n_cheby_bdry_pts] @ P
+    Y = soln[:, : P.shape[1]]
 
     # Phi has shape (n_cheby_pts, n_cheby_interior_pts). It maps from the source
     # term evaluated on the interior Cheby nodes to the particular soln on all of
     # the Cheby nodes.
-    Phi = B_inv[:, n_cheby_bdry_pts:]
+    Phi = soln[:, P.shape[1] :]
 
     # Interpolate to Gauss nodes
     T = QH @ Y
     return (T, Y, Phi)
 
 
-vmapped_get_ItI_nosource = jax.vmap(
-    get_ItI_nosource,
-    in_axes=(0, None, None, None),
-    out_axes=(0, 0, 0),
+vmapped_get_ItI_nosource = jax.jit(
+    jax.vmap(
+        get_ItI_nosource,
+        in_axes=(0, None, None, None),
+        out_axes=(0, 0, 0),
+    )
 )
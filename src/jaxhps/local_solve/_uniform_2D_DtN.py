@@ -1,5 +1,6 @@
 import jax.numpy as jnp
 import jax
+import numpy as np
 
 from .._pdeproblem import PDEProblem
 from typing import Tuple
@@ -55,25 +56,15 @@ def local_solve_stage_uniform_2D_DtN(
         device,
     )
     bool_multi_source = source_term.ndim == 3
-    # stack the precomputed differential operators into a single array
-    diff_ops = jnp.stack(
-        [
-            pde_problem.D_xx,
-            pde_problem.D_xy,
-            pde_problem.D_yy,
-            pde_problem.D_x,
-            pde_problem.D_y,
-            jnp.eye(pde_problem.D_xx.shape[0], dtype=jnp.float64),
-        ]
-    )
+    diff_ops = pde_problem._get_stacked_diff_ops()
 
     # Put the input data on the device
     coeffs_gathered = jax.device_put(
         coeffs_gathered,
         device,
     )
-    diff_operators = vmapped_assemble_diff_operator(
-        coeffs_gathered, which_coeffs, diff_ops
+    diff_operators = _assemble_diff_operators(
+        coeffs_gathered, diff_ops[which_coeffs]
     )
     if not bool_multi_source:
         source_term = jnp.expand_dims(source_term, axis=-1)
@@ -87,14 +78,10 @@ def local_solve_stage_uniform_2D_DtN(
         v = v[..., 0]
 
     # Return data to the requested device
-    T_arr_host = jax.device_put(T_arr, host_device)
-    del T_arr
-    v_host = jax.device_put(v, host_device)
-    del v
-    h_host = jax.device_put(h, host_device)
-    del h
-    Y_arr_host = jax.device_put(Y_arr, host_device)
-    del Y_arr
+    Y_arr_host, T_arr_host, v_host, h_host = jax.device_put(
+        (Y_arr, T_arr, v, h), host_device
+    )
+    del Y_arr, T_arr, v, h
 
     # Return the DtN arrays, particular solutions, particular
     # solution fluxes, and the solution operators. The solution
@@ -102,7 +89,6 @@ def local_solve_stage_uniform_2D_DtN(
     return Y_arr_host, T_arr_host, v_host, h_host
 
 
-@jax.jit
 def _gather_coeffs_2D(
     D_xx_coeffs: jax.Array | None = None,
     D_xy_coeffs: jax.Array | None = None,
@@ -110,13 +96,13 @@ def _gather_coeffs_2D(
     D_x_coeffs: jax.Array | None = None,
     D_y_coeffs: jax.Array | None = None,
     I_coeffs: jax.Array | None = None,
-) -> Tuple[jax.Array, jax.Array]:
+) -> Tuple[jax.Array, np.ndarray]:
     """If not None, expects each input to have shape (n_leaf_nodes, p**2).
 
     Returns:
-        Tuple[jax.Array, jax.Array]: coeffs_gathered and which_coeffs
+        Tuple[jax.Array, np.ndarray]: coeffs_gathered and which_coeffs
             coeffs_gathered is an array of shape (?, n_leaf_nodes, p**2) containing the non-None coefficients.
-            which_coeffs is an array of shape (6) containing boolean values specifying which coefficients were not None.
+            which_coeffs is a NumPy array of shape (6) containing boolean values specifying which coefficients were not None.
     """
     coeffs_lst = [
         D_xx_coeffs,
@@ -126,57 +112,35 @@ def _gather_coeffs_2D(
         D_y_coeffs,
         I_coeffs,
     ]
-    which_coeffs = jnp.array([coeff is not None for coeff in coeffs_lst])
-    coeffs_gathered = jnp.array(
+    # which_coeffs is a NumPy array so it is known on the host. Selecting the
+    # matching differential operators with it is then a static slice and does
+    # not wait on the device.
+    which_coeffs = np.array([coeff is not None for coeff in coeffs_lst])
+    coeffs_gathered = jnp.stack(
         [coeff for coeff in coeffs_lst if coeff is not None]
     )
     return coeffs_gathered, which_coeffs
 
 
 @jax.jit
-def _add(
-    out: jax.Array,
-    coeff: jax.Array,
-    diff_op: jax.Array,
+def _scatter_coeffs(
+    coeffs_arr: jax.Array, which_coeffs: jax.Array
 ) -> jax.Array:
-    """One branch of add_or_not. Expects out to have shape (p**2, p**2), coeff has shape (p**2), diff_op has shape (p**2, p**2)."""
-    # res = out + jnp.diag(coeff) @ diff_op
-    res = out + jnp.einsum("ab,a->ab", diff_op, coeff)
-    return res
-
-
-@jax.jit
-def _not(out: jax.Array, coeff: jax.Array, diff_op: jax.Array) -> jax.Array:
-    return out
+    """Scatters the gathered coefficients into a dense array with one row per
+    differential operator. Rows corresponding to missing coefficients are zero,
+    so every operator can be included in a single contraction without branching.
 
+    Args:
+        coeffs_arr (jax.Array): Has shape (?, p**2).
+        which_coeffs (jax.Array): Has shape (n_ops,) and specifies which coefficients are not None.
 
-@jax.jit
-def add_or_not(
-    i: int,
-    carry_tuple: Tuple[jax.Array, jax.Array, jax.Array, jax.Array, int],
-) -> Tuple[jax.Array, jax.Array, jax.Array, jax.Array]:
-    """body function for loop in assemble_diff_operator."""
-    out = carry_tuple[0]
-    coeffs_arr = carry_tuple[1]
-    diff_ops = carry_tuple[2]
-    which_coeffs = carry_tuple[3]
-    counter = carry_tuple[4]
-
-    out = jax.lax.cond(
-        which_coeffs[i],
-        _add,
-        _not,
-        out,
-        coeffs_arr[counter],
-        diff_ops[i],
-    )
-    counter = jax.lax.cond(
-        which_coeffs[i],
-        lambda x: x + 1,
-        lambda x: x,
-        counter,
+    Returns:
+        jax.Array: Has shape (n_ops, p**2).
+    """
+    idxes = jnp.cumsum(which_coeffs) - 1
+    return jnp.where(
+        which_coeffs[:, None], coeffs_arr[jnp.maximum(idxes, 0)], 0
     )
-    return (out, coeffs_arr, diff_ops, which_coeffs, counter)
 
 
 @jax.jit
@@ -196,33 +160,39 @@ def assemble_diff_operator(
         jax.Array: Has shape (p**2, p**2).
     """
 
-    n_loops = which_coeffs.shape[0]
+    coeffs_dense = _scatter_coeffs(coeffs_arr, which_coeffs)
 
-    # Initialize with the shape of diff_ops but the data type of coeffs_arr.
-    # This is important because we may want to use complex coefficients.
-    out = jnp.zeros_like(diff_ops[0], dtype=coeffs_arr.dtype)
+    # out = sum_i diag(coeffs_dense[i]) @ diff_ops[i]. The output has the
+    # data type of coeffs_arr, which may be complex. This is written as a
+    # broadcast multiply and sum rather than an einsum: XLA fuses it into a
+    # single elementwise pass, while the einsum lowers to a dot_general with
+    # a tiny contraction dimension which is much slower under vmap.
+    out = jnp.sum(coeffs_dense[:, :, None] * diff_ops, axis=0)
 
-    # Commenting this out because it is very memory intensive
-    counter = 0
-    init_val = (out, coeffs_arr, diff_ops, which_coeffs, counter)
-    out, _, _, _, _ = jax.lax.fori_loop(0, n_loops, add_or_not, init_val)
+    return out
 
-    # Semantically the same as this:
-    # counter = 0
-    # for i in range(n_loops):
-    #     if which_coeffs[i]:
-    #         # out += jnp.diag(coeffs_arr[counter]) @ diff_ops[i]
-    #         out += jnp.einsum("ab,a->ab", diff_ops[i], coeffs_arr[counter])
-    #         counter += 1
 
-    return out
+@jax.jit
+def _assemble_diff_operators(
+    coeffs_gathered: jax.Array, diff_ops: jax.Array
+) -> jax.Array:
+    """Assembles the differential operator on every leaf. Only the operators
+    whose coefficients are not None are passed in, so the compiled program is
+    specialized to the coefficients that are present and does no work for the
+    missing ones. Each term is a broadcast multiply which XLA fuses into a
+    single pass over the output.
 
+    Args:
+        coeffs_gathered (jax.Array): Has shape (n_present, n_leaves, p**2).
+        diff_ops (jax.Array): Has shape (n_present, p**2, p**2). diff_ops[i] is the operator multiplied by coeffs_gathered[i].
 
-vmapped_assemble_diff_operator = jax.vmap(
-    assemble_diff_operator,
-    in_axes=(1, None, None),
-    out_axes=0,
-)
+    Returns:
+        jax.Array: Has shape (n_leaves, p**2, p**2).
+    """
+    out = coeffs_gathered[0][:, :, None] * diff_ops[0]
+    for i in range(1, coeffs_gathered.shape[0]):
+        out = out + coeffs_gathered[i][:, :, None] * diff_ops[i]
+    return out
 
 
 @jax.jit
@@ -254,25 +224,34 @@ def get_DtN(
     n_src = source_term.shape[-1]
 
     A_ii = diff_operator[n_cheby_bdry:, n_cheby_bdry:]
-    A_ii_inv = jnp.linalg.inv(A_ii)
     # A_ie shape (n_cheby_int, n_cheby_bdry)
     A_ie = diff_operator[n_cheby_bdry:, :n_cheby_bdry]
-    L_2 = jnp.zeros((diff_operator.shape[0], n_cheby_bdry), dtype=jnp.float64)
-    L_2 = L_2.at[:n_cheby_bdry].set(jnp.eye(n_cheby_bdry))
-    soln_operator = -1 * A_ii_inv @ A_ie
-    L_2 = L_2.at[n_cheby_bdry:].set(soln_operator)
-    Y = L_2 @ P
+
+    # Solve for the interior solution operator and the interior particular
+    # solution together, so A_ii is only factored once.
+    rhs = jnp.concatenate([-1 * A_ie, source_term[n_cheby_bdry:]], axis=1)
+    soln = jnp.linalg.solve(A_ii, rhs)
+    soln_operator = soln[:, :n_cheby_bdry]
+    v_int = soln[:, n_cheby_bdry:]
+
+    # Y = [I; soln_operator] @ P
+    Y = jnp.concatenate([P, soln_operator @ P], axis=0)
     T = Q @ Y
 
-    v = jnp.zeros((diff_operator.shape[0], n_src), dtype=jnp.float64)
-    v = v.at[n_cheby_bdry:].set(A_ii_inv @ source_term[n_cheby_bdry:])
+    v = jnp.concatenate(
+        [jnp.zeros((n_cheby_bdry, n_src), dtype=v_int.dtype), v_int], axis=0
+    )
     h = Q @ v
 
     return Y, T, v, h
 
 
-vmapped_get_DtN_uniform = jax.vmap(
-    get_DtN,
-    in_axes=(0, 0, None, None),
-    out_axes=(0, 0, 0, 0),
+# The vmapped kernels are wrapped in jax.jit so that repeated calls on
+# same-shaped chunks reuse one compiled program and dispatch once.
+vmapped_get_DtN_uniform = jax.jit(
+    jax.vmap(
+        get_DtN,
+        in_axes=(0, 0, None, None),
+        out_axes=(0, 0, 0, 0),
+    )
 )
@@ -2,7 +2,7 @@ import jax.numpy as jnp
 import jax
 
 from .._pdeproblem import PDEProblem
-from ._uniform_2D_DtN import _gather_coeffs_2D, vmapped_assemble_diff_operator
+from ._uniform_2D_DtN import _gather_coeffs_2D, _assemble_diff_operators
 from typing import Tuple
 import logging
 
@@ -58,25 +58,15 @@ def local_solve_stage_uniform_2D_ItI(
     )
     bool_multi_source = source_term.ndim == 3
 
-    # stack the precomputed differential operators into a single array
-    diff_ops = jnp.stack(
-        [
-            pde_problem.D_xx,
-            pde_problem.D_xy,
-            pde_problem.D_yy,
-            pde_problem.D_x,
-            pde_problem.D_y,
-            jnp.eye(pde_problem.D_xx.shape[0], dtype=jnp.float64),
-        ]
-    )
+    diff_ops = pde_problem._get_stacked_diff_ops()
 
     coeffs_gathered = jax.device_put(
         coeffs_gathered,
         device,
     )
 
-    all_diff_operators = vmapped_assemble_diff_operator(
-        coeffs_gathered, which_coeffs, diff_ops
+    all_diff_operators = _assemble_diff_operators(
+        coeffs_gathered, diff_ops[which_coeffs]
     )
 
     if not bool_multi_source:
@@ -103,11 +93,9 @@ def local_solve_stage_uniform_2D_ItI(
         h = h[..., 0]
         v = v[..., 0]
 
-    R_arr_host = jax.device_put(R_arr, host_device)
-    Y_arr_host = jax.device_put(Y_arr, host_device)
-
-    h_arr_host = jax.device_put(h, host_device)
-    v_arr_host = jax.device_put(v, host_device)
+    R_arr_host, Y_arr_host, h_arr_host, v_arr_host = jax.device_put(
+        (R_arr, Y_arr, h, v), host_device
+    )
 
     return (
         Y_arr_host,
@@ -161,23 +149,45 @@ def get_ItI(
 
     # B has shape (n_cheby_pts, n_cheby_pts). Its top rows are F and its bottom rows are the
     # bottom rows of A.
-    B = jnp.zeros((n_cheby_pts, n_cheby_pts), dtype=jnp.complex128)
-    B = B.at[:n_cheby_bdry_pts].set(G)
-    B = B.at[n_cheby_bdry_pts:].set(A[n_cheby_bdry_pts:])
-    B_inv = jnp.linalg.inv(B)
-
-    # Phi has shape (n_cheby_pts, n_cheby_interior_pts). It maps from the source
-    # term evaluated on the interior Cheby nodes to the particular soln on all of
-    # the Cheby nodes.
-    Phi = B_inv[:, n_cheby_bdry_pts:]
+    # The working precision follows the inputs. In the usual double
+    # precision setup this is complex128.
+    B = jnp.concatenate([G, A[n_cheby_bdry_pts:]], axis=0)
+
+    # Factor B once and reuse the factorization for both Y and v. The
+    # homogeneous part is solved directly against [P; 0], which has fewer
+    # columns than the identity on the Cheby boundary and saves a matmul.
+    lu_and_piv = jax.scipy.linalg.lu_factor(B)
+    bool_single_source = source_term.ndim == 1
+    if bool_single_source:
+        source_term = jnp.expand_dims(source_term, axis=-1)
+    n_src = source_term.shape[-1]
+    n_gauss_bdry_pts = P.shape[1]
+    dtype = jnp.result_type(B, P, source_term)
+    n_cheby_int_pts = n_cheby_pts - n_cheby_bdry_pts
+    rhs = jnp.block(
+        [
+            [
+                P.astype(dtype),
+                jnp.zeros((n_cheby_bdry_pts, n_src), dtype=dtype),
+            ],
+            [
+                jnp.zeros((n_cheby_int_pts, n_gauss_bdry_pts), dtype=dtype),
+                source_term[n_cheby_bdry_pts:].astype(dtype),
+            ],
+        ]
+    )
+    soln = jax.scipy.linalg.lu_solve(lu_and_piv, rhs)
 
-    # Y has shape (n_cheby_pts, n_cheby_bdry_pts). It maps from
+    # Y has shape (n_cheby_pts, n_gauss_bdry_pts). It maps from
     # incoming impedance data on the boundary G-L nodes to the
     # homogeneous solution on all of the Cheby nodes.
-    Y = B_inv[:, :n_cheby_bdry_pts] @ P
+    Y = soln[:, :n_gauss_bdry_pts]
 
-    source_int = source_term[n_cheby_bdry_pts:]
-    v = Phi @ source_int
+    # v has shape (n_cheby_pts, n_sources). It is the particular solution
+    # on all of the Cheby nodes.
+    v = soln[:, n_gauss_bdry_pts:]
+    if bool_single_source:
+        v = v[:, 0]
     # part_soln = part_soln.at[:n_cheby_bdry_pts].set(0.0)
     h = QH @ v
 
@@ -186,8 +196,10 @@ def get_ItI(
     return (T, Y, h, v)
 
 
-vmapped_get_ItI = jax.vmap(
-    get_ItI,
-    in_axes=(0, 0, None, None, None),
-    out_axes=(0, 0, 0, 0),
+vmapped_get_ItI = jax.jit(
+    jax.vmap(
+        get_ItI,
+        in_axes=(0, 0, None, None, None),
+        out_axes=(0, 0, 0, 0),
+    )
 )
@@ -1,12 +1,13 @@
 import jax.numpy as jnp
 import jax
+import numpy as np
 
 from .._pdeproblem import PDEProblem
 from typing import Tuple
 
 from ._uniform_2D_DtN import (
     vmapped_get_DtN_uniform,
-    vmapped_assemble_diff_operator,
+    _assemble_diff_operators,
 )
 
 
@@ -58,26 +59,12 @@ def local_solve_stage_uniform_3D_DtN(
     bool_multi_source = source_term.ndim == 3
     source_term = jax.device_put(source_term, device)
 
-    # stack the precomputed differential operators into a single array
-    diff_ops = jnp.stack(
-        [
-            pde_problem.D_xx,
-            pde_problem.D_xy,
-            pde_problem.D_yy,
-            pde_problem.D_xz,
-            pde_problem.D_yz,
-            pde_problem.D_zz,
-            pde_problem.D_x,
-            pde_problem.D_y,
-            pde_problem.D_z,
-            jnp.eye(pde_problem.domain.p**3),
-        ]
-    )
+    diff_ops = pde_problem._get_stacked_diff_ops()
     # Now that arrays are in contiguous blocks of memory, we can move them to the GPU.
     diff_ops = jax.device_put(diff_ops, device)
     coeffs_gathered = jax.device_put(coeffs_gathered, device)
-    diff_operators = vmapped_assemble_diff_operator(
-        coeffs_gathered, which_coeffs, diff_ops
+    diff_operators = _assemble_diff_operators(
+        coeffs_gathered, diff_ops[which_coeffs]
     )
     if not bool_multi_source:
         source_term = jnp.expand_dims(source_term, axis=-1)
@@ -91,14 +78,10 @@ def local_solve_stage_uniform_3D_DtN(
         v = v[..., 0]
 
     # Return data to the requested device
-    T_arr_host = jax.device_put(T_arr, host_device)
-    del T_arr
-    v_host = jax.device_put(v, host_device)
-    del v
-    h_host = jax.device_put(h, host_device)
-    del h
-    Y_arr_host = jax.device_put(Y_arr, host_device)
-    del Y_arr
+    Y_arr_host, T_arr_host, v_host, h_host = jax.device_put(
+        (Y_arr, T_arr, v, h), host_device
+    )
+    del Y_arr, T_arr, v, h
 
     # Return the DtN arrays, particular solutions, particular
     # solution fluxes, and the solution operators. The solution
@@ -106,7 +89,6 @@ def local_solve_stage_uniform_3D_DtN(
     return Y_arr_host, T_arr_host, v_host, h_host
 
 
-@jax.jit
 def _gather_coeffs_3D(
     D_xx_coeffs: jnp.ndarray | None = None,
     D_xy_coeffs: jnp.ndarray | None = None,
@@ -118,13 +100,13 @@ def _gather_coeffs_3D(
     D_y_coeffs: jnp.ndarray | None = None,
     D_z_coeffs: jnp.ndarray | None = None,
     I_coeffs: jnp.ndarray | None = None,
-) -> Tuple[jnp.ndarray, jnp.ndarray]:
+) -> Tuple[jnp.ndarray, np.ndarray]:
     """If not None, expects each input to have shape (n_leaf_nodes, p**2).
 
     Returns:
-        Tuple[jnp.ndarray, jnp.ndarray]: coeffs_gathered and which_coeffs
+        Tuple[jnp.ndarray, np.ndarray]: coeffs_gathered and which_coeffs
             coeffs_gathered is an array of shape (?, n_leaf_nodes, p**3) containing the non-None coefficients.
-            which_coeffs is an array of shape (10) containing boolean values specifying which coefficients were not None.
+            which_coeffs is a NumPy array of shape (10) containing boolean values specifying which coefficients were not None.
     """
     coeffs_lst = [
         D_xx_coeffs,
@@ -138,8 +120,8 @@ def _gather_coeffs_3D(
         D_z_coeffs,
         I_coeffs,
     ]
-    which_coeffs = jnp.array([coeff is not None for coeff in coeffs_lst])
-    coeffs_gathered = jnp.array(
+    which_coeffs = np.array([coeff is not None for coeff in coeffs_lst])
+    coeffs_gathered = jnp.stack(
         [coeff for coeff in coeffs_lst if coeff is not None]
     )
     return coeffs_gathered, which_coeffs
@@ -1,7 +1,9 @@
 from typing import List, Tuple
 import jax
 import jax.numpy as jnp
+import numpy as np
 from .._pdeproblem import PDEProblem
+from ._utils_uniform_2D import _child_bdry_idxes
 import logging
 
 
@@ -86,18 +88,11 @@ def up_pass_uniform_2D_DtN(
         h_in.shape,
     )
 
-    g_tilde_lst = []
-
-    for i in range(len(D_inv_lst)):
-        # Get h and g_tilde for this level
-
-        nnodes, nbdry, nsrc = h_in.shape
-        h_in = h_in.reshape(nnodes // 4, 4, nbdry, nsrc)
-        D_inv = D_inv_lst[i]
-        BD_inv = BD_inv_lst[i]
-
-        h_in, g_tilde = vmapped_assemble_boundary_data_DtN(h_in, D_inv, BD_inv)
-        g_tilde_lst.append(g_tilde)
+    # Merge the particular solution data up the tree. All of the levels are
+    # traced into a single XLA program.
+    h_in, g_tilde_lst = _assemble_all_levels_2D_DtN(
+        h_in, list(D_inv_lst), list(BD_inv_lst)
+    )
 
     out = (v, g_tilde_lst)
 
@@ -107,6 +102,34 @@ def up_pass_uniform_2D_DtN(
     return out
 
 
+@jax.jit
+def _assemble_all_levels_2D_DtN(
+    h_in: jax.Array,
+    D_inv_lst: List[jax.Array],
+    BD_inv_lst: List[jax.Array],
+) -> Tuple[jax.Array, List[jax.Array]]:
+    """
+    Merges the leaf-level particular solution data up the quadtree, one level at a time.
+
+    Args:
+        h_in (jax.Array): Has shape (n_leaves, n_bdry_leaf, n_src)
+        D_inv_lst (List[jax.Array]): Saved merge operators, ordered from the leaves to the root.
+        BD_inv_lst (List[jax.Array]): Saved merge operators, ordered from the leaves to the root.
+
+    Returns:
+        Tuple[jax.Array, List[jax.Array]]:
+            h_in: Has shape (1, n_bdry_root, n_src)
+            g_tilde_lst: Incoming particular solution data along the merge interfaces, ordered from the leaves to the root.
+    """
+    g_tilde_lst = []
+    for D_inv, BD_inv in zip(D_inv_lst, BD_inv_lst):
+        nnodes, nbdry, nsrc = h_in.shape
+        h_in = h_in.reshape(nnodes // 4, 4, nbdry, nsrc)
+        h_in, g_tilde = vmapped_assemble_boundary_data_DtN(h_in, D_inv, BD_inv)
+        g_tilde_lst.append(g_tilde)
+    return h_in, g_tilde_lst
+
+
 @jax.jit
 def assemble_boundary_data_DtN(
     h_in: jax.Array,
@@ -129,41 +152,25 @@ def assemble_boundary_data_DtN(
     """
 
     nside = h_in.shape[1] // 4
+    idxes = _child_bdry_idxes(nside)
 
-    # Remember, the slices along the merge interface go from OUTSIDE to INSIDE
-    h_a = h_in[0]
-    h_a_1 = jnp.concatenate([h_a[-nside:], h_a[:nside]])
-    h_a_5 = h_a[nside : 2 * nside]
-    h_a_8 = jnp.flipud(h_a[2 * nside : 3 * nside])
-
-    h_b = h_in[1]
-    h_b_2 = h_b[: 2 * nside]
-    h_b_6 = h_b[2 * nside : 3 * nside]
-    h_b_5 = jnp.flipud(h_b[3 * nside : 4 * nside])
-
-    h_c = h_in[2]
-    h_c_6 = jnp.flipud(h_c[:nside])
-    h_c_3 = h_c[nside : 3 * nside]
-    h_c_7 = h_c[3 * nside : 4 * nside]
-
-    h_d = h_in[3]
-    h_d_8 = h_d[:nside]
-    h_d_7 = jnp.flipud(h_d[nside : 2 * nside])
-    h_d_4 = h_d[2 * nside : 4 * nside]
-
-    h_int_child = jnp.concatenate(
-        [h_a_5 + h_b_5, h_b_6 + h_c_6, h_c_7 + h_d_7, h_d_8 + h_a_8]
-    )
+    h_flat = h_in.reshape((16 * nside,) + h_in.shape[2:])
 
-    h_ext_child = jnp.concatenate([h_a_1, h_b_2, h_c_3, h_d_4])
+    # Both children's outgoing data along each merge interface are summed.
+    # Ordered like interfaces 5, 6, 7, 8.
+    int_idxes_0 = np.concatenate(
+        [idxes["a_5"], idxes["b_6"], idxes["c_7"], idxes["d_8"]]
+    )
+    int_idxes_1 = np.concatenate(
+        [idxes["b_5"], idxes["c_6"], idxes["d_7"], idxes["a_8"]]
+    )
+    h_int_child = h_flat[int_idxes_0] + h_flat[int_idxes_1]
 
     g_tilde = -1 * D_inv @ h_int_child
 
-    h = h_ext_child - BD_inv @ h_int_child
-
-    # h is ordered like h_a_1, h_b_2, h_c_3, h_d_4. Need to
-    # roll it so that it's ordered like [bottom, left, right, top].
-    h = jnp.roll(h, -nside, axis=0)
+    # Roll the exterior data to [bottom, left, right, top] order.
+    roll = (np.arange(8 * nside, dtype=np.int32) + nside) % (8 * nside)
+    h = h_flat[idxes["ext"][roll]] - (BD_inv @ h_int_child)[roll]
 
     return h, g_tilde
 
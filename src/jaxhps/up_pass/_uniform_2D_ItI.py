@@ -1,9 +1,15 @@
+import functools
 from typing import List, Tuple
 import jax
 import jax.numpy as jnp
+import numpy as np
 from .._pdeproblem import PDEProblem
+from ._utils_uniform_2D import _child_bdry_idxes
 import logging
 
+#: Number of sources handled by each pipelined chunk of the 2D ItI upward pass.
+UP_PASS_SRC_CHUNKSIZE = 64
+
 
 def up_pass_uniform_2D_ItI(
     source: jax.Array,
@@ -72,43 +78,66 @@ def up_pass_uniform_2D_ItI(
     logging.debug(
         "up_pass_uniform_2D_ItI: source shape = %s", source_int.shape
     )
-    # Get the particular solution. It's an einsum of the source term with
-    # the Phi array stored in the PDEProblem.
-    v = jnp.einsum("ijk,ikl->ijl", pde_problem.Phi, source_int)
-    logging.debug(
-        "up_pass_uniform_2D_ItI: after local solve, v shape = %s", v.shape
-    )
     logging.debug(
         "up_pass_uniform_2D_ItI: QH shape = %s",
         pde_problem.QH.shape,
     )
 
-    # Get leaf-level h_in array, which is an einsum between the particular soln and
-    # the QH array stored in the PDEProblem.
-    h_in = jnp.einsum("ij,kjl->kil", pde_problem.QH, v)
-
-    # Y, T, v, h_in = local_solve_stage_uniform_2D_ItI(
-    #     pde_problem=pde_problem,
-    #     device=device,
-    #     host_device=host_device,
-    # )
-    logging.debug(
-        "up_pass_uniform_2D_ItI: after local solve, h_in shape = %s",
-        h_in.shape,
+    # Move the precomputed operators to the device
+    Phi, QH, D_inv_lst, BD_inv_lst = jax.device_put(
+        (pde_problem.Phi, pde_problem.QH, list(D_inv_lst), list(BD_inv_lst)),
+        device,
     )
 
-    g_tilde_lst = []
-
-    for i in range(len(D_inv_lst)):
-        # Get h and g_tilde for this level
-
-        nnodes, nbdry, nsrc = h_in.shape
-        h_in = h_in.reshape(nnodes // 4, 4, nbdry, nsrc)
-        D_inv = D_inv_lst[i]
-        BD_inv = BD_inv_lst[i]
+    nsrc = source_int.shape[-1]
+    on_device = isinstance(source_int, jax.Array) and (
+        source_int.devices() == {device}
+    )
+    if on_device or nsrc <= UP_PASS_SRC_CHUNKSIZE:
+        v, g_tilde_lst, h_in = _up_pass_chunk_2D_ItI(
+            jax.device_put(source_int, device), Phi, QH, D_inv_lst, BD_inv_lst
+        )
+    else:
+        # The sources are not on the device yet, so they are processed in
+        # chunks along the nsrc axis. The transfer of chunk k + 1 is issued
+        # before the computation on chunk k is dispatched, so the
+        # host-to-device copy overlaps with the compute. The last chunk is
+        # shifted back to end at nsrc, so every chunk has the same shape.
+        starts = list(
+            range(0, nsrc - UP_PASS_SRC_CHUNKSIZE, UP_PASS_SRC_CHUNKSIZE)
+        )
+        starts.append(nsrc - UP_PASS_SRC_CHUNKSIZE)
+        next_chunk = jax.device_put(
+            source_int[..., :UP_PASS_SRC_CHUNKSIZE], device
+        )
+        out = None
+        for k, start_idx in enumerate(starts):
+            chunk = next_chunk
+            if k + 1 < len(starts):
+                next_start = starts[k + 1]
+                next_chunk = jax.device_put(
+                    source_int[
+                        ..., next_start : next_start + UP_PASS_SRC_CHUNKSIZE
+                    ],
+                    device,
+                )
+            chunk_out = _up_pass_chunk_2D_ItI(
+                chunk, Phi, QH, D_inv_lst, BD_inv_lst
+            )
+            if out is None:
+                out = jax.tree.map(
+                    lambda x: jnp.zeros(
+                        x.shape[:-1] + (nsrc,), dtype=x.dtype, device=device
+                    ),
+                    chunk_out,
+                )
+            out = _set_src_chunk(out, chunk_out, start_idx)
+            del chunk_out
+        v, g_tilde_lst, h_in = out
 
-        h_in, g_tilde = vmapped_assemble_boundary_data(h_in, D_inv, BD_inv)
-        g_tilde_lst.append(g_tilde)
+    logging.debug(
+        "up_pass_uniform_2D_ItI: after local solve, v shape = %s", v.shape
+    )
 
     logging.debug(
         "up_pass_uniform_2D_ItI: g_tilde_lst shapes = %s",
@@ -136,6 +165,99 @@ def up_pass_uniform_2D_ItI(
     return out
 
 
+@jax.jit
+def _up_pass_chunk_2D_ItI(
+    source_int: jax.Array,
+    Phi: jax.Array,
+    QH: jax.Array,
+    D_inv_lst: List[jax.Array],
+    BD_inv_lst: List[jax.Array],
+) -> Tuple[jax.Array, List[jax.Array], jax.Array]:
+    """
+    Computes the particular solutions on the leaves and merges their outgoing impedance data up the quadtree for one chunk of sources.
+
+    Args:
+        source_int (jax.Array): Has shape (n_leaves, n_int, n_src)
+        Phi (jax.Array): Has shape (n_leaves, p^2, n_int)
+        QH (jax.Array): Has shape (4q, p^2)
+        D_inv_lst (List[jax.Array]): Saved merge operators, ordered from the leaves to the root.
+        BD_inv_lst (List[jax.Array]): Saved merge operators, ordered from the leaves to the root.
+
+    Returns:
+        Tuple[jax.Array, List[jax.Array], jax.Array]:
+            v: Has shape (n_leaves, p^2, n_src)
+            g_tilde_lst: Incoming particular solution data along the merge interfaces, ordered from the leaves to the root.
+            h_in: Has shape (1, n_bdry_root, n_src)
+    """
+    # Get the particular solution. It's an einsum of the source term with
+    # the Phi array stored in the PDEProblem.
+    v = jnp.einsum("ijk,ikl->ijl", Phi, source_int)
+
+    # Get leaf-level h_in array, which is an einsum between the particular soln and
+    # the QH array stored in the PDEProblem.
+    h_in = jnp.einsum("ij,kjl->kil", QH, v)
+
+    h_in, g_tilde_lst = _assemble_all_levels_2D_ItI(
+        h_in, D_inv_lst, BD_inv_lst
+    )
+    return v, g_tilde_lst, h_in
+
+
+@functools.partial(jax.jit, donate_argnums=(0,))
+def _set_src_chunk(
+    out: Tuple[jax.Array, List[jax.Array], jax.Array],
+    chunk_out: Tuple[jax.Array, List[jax.Array], jax.Array],
+    start_idx: int,
+) -> Tuple[jax.Array, List[jax.Array], jax.Array]:
+    """
+    Writes one chunk's outputs into the full output arrays along the source
+    axis. The buffers of out are donated, so the update is done in place.
+
+    Args:
+        out (Tuple[jax.Array, List[jax.Array], jax.Array]): The full (v, g_tilde_lst, h_in) outputs.
+        chunk_out (Tuple[jax.Array, List[jax.Array], jax.Array]): The outputs for one chunk of sources.
+        start_idx (int): Index of the first source in the chunk.
+
+    Returns:
+        Tuple[jax.Array, List[jax.Array], jax.Array]: The updated outputs.
+    """
+    return jax.tree.map(
+        lambda o, c: jax.lax.dynamic_update_slice_in_dim(
+            o, c, start_idx, axis=-1
+        ),
+        out,
+        chunk_out,
+    )
+
+
+@jax.jit
+def _assemble_all_levels_2D_ItI(
+    h_in: jax.Array,
+    D_inv_lst: List[jax.Array],
+    BD_inv_lst: List[jax.Array],
+) -> Tuple[jax.Array, List[jax.Array]]:
+    """
+    Merges the leaf-level particular solution data up the quadtree, one level at a time.
+
+    Args:
+        h_in (jax.Array): Has shape (n_leaves, n_bdry_leaf, n_src)
+        D_inv_lst (List[jax.Array]): Saved merge operators, ordered from the leaves to the root.
+        BD_inv_lst (List[jax.Array]): Saved merge operators, ordered from the leaves to the root.
+
+    Returns:
+        Tuple[jax.Array, List[jax.Array]]:
+            h_in: Has shape (1, n_bdry_root, n_src)
+            g_tilde_lst: Incoming particular solution data along the merge interfaces, ordered from the leaves to the root.
+    """
+    g_tilde_lst = []
+    for D_inv, BD_inv in zip(D_inv_lst, BD_inv_lst):
+        nnodes, nbdry, nsrc = h_in.shape
+        h_in = h_in.reshape(nnodes // 4, 4, nbdry, nsrc)
+        h_in, g_tilde = vmapped_assemble_boundary_data(h_in, D_inv, BD_inv)
+        g_tilde_lst.append(g_tilde)
+    return h_in, g_tilde_lst
+
+
 @jax.jit
 def assemble_boundary_data(
     h_in: jax.Array,
@@ -158,58 +280,51 @@ def assemble_boundary_data(
     """
 
     nside = h_in.shape[1] // 4
+    idxes = _child_bdry_idxes(nside)
 
-    # Remember, the slices along the merge interface go from OUTSIDE to INSIDE
-    h_a = h_in[0]
-    h_a_1 = jnp.concatenate([h_a[-nside:], h_a[:nside]])
-    h_a_5 = h_a[nside : 2 * nside]
-    h_a_8 = jnp.flipud(h_a[2 * nside : 3 * nside])
-
-    h_b = h_in[1]
-    h_b_2 = h_b[: 2 * nside]
-    h_b_6 = h_b[2 * nside : 3 * nside]
-    h_b_5 = jnp.flipud(h_b[3 * nside : 4 * nside])
-
-    h_c = h_in[2]
-    h_c_6 = jnp.flipud(h_c[:nside])
-    h_c_3 = h_c[nside : 3 * nside]
-    h_c_7 = h_c[3 * nside : 4 * nside]
-
-    h_d = h_in[3]
-    h_d_8 = h_d[:nside]
-    h_d_7 = jnp.flipud(h_d[nside : 2 * nside])
-    h_d_4 = h_d[2 * nside : 4 * nside]
-
-    h_int_child = jnp.concatenate(
-        [h_b_5, h_d_8, h_b_6, h_d_7, h_a_5, h_c_6, h_c_7, h_a_8]
-    )
+    # Stack the four children's boundary data so every slice below is a
+    # single gather with a precomputed index array.
+    h_flat = h_in.reshape((16 * nside,) + h_in.shape[2:])
 
-    h_ext_child = jnp.concatenate([h_a_1, h_b_2, h_c_3, h_d_4])
+    # Ordered like b_5, d_8, b_6, d_7, a_5, c_6, c_7, a_8.
+    int_idxes = np.concatenate(
+        [
+            idxes["b_5"],
+            idxes["d_8"],
+            idxes["b_6"],
+            idxes["d_7"],
+            idxes["a_5"],
+            idxes["c_6"],
+            idxes["c_7"],
+            idxes["a_8"],
+        ]
+    )
+    h_int_child = h_flat[int_idxes]
 
     g_tilde = -1 * D_inv @ h_int_child
 
     # g_tilde is ordered like a_5, a_8, c_6, c_7, b_5, b_6, d_7, d_8.
     # Want to rearrange it so it's ordered like
     # a_5, b_5, b_6, c_6, c_7, d_7, d_8, a_8
-    r = jnp.concatenate(
+    r = np.concatenate(
         [
-            jnp.arange(nside),  # a5
-            jnp.arange(4 * nside, 5 * nside),  # b5
-            jnp.arange(5 * nside, 6 * nside),  # b6
-            jnp.arange(2 * nside, 3 * nside),  # c6
-            jnp.arange(3 * nside, 4 * nside),  # c7
-            jnp.arange(6 * nside, 7 * nside),  # d7
-            jnp.arange(7 * nside, 8 * nside),  # d8
-            jnp.arange(nside, 2 * nside),  # a8
+            np.arange(nside, dtype=np.int32),  # a5
+            np.arange(4 * nside, 5 * nside, dtype=np.int32),  # b5
+            np.arange(5 * nside, 6 * nside, dtype=np.int32),  # b6
+            np.arange(2 * nside, 3 * nside, dtype=np.int32),  # c6
+            np.arange(3 * nside, 4 * nside, dtype=np.int32),  # c7
+            np.arange(6 * nside, 7 * nside, dtype=np.int32),  # d7
+            np.arange(7 * nside, 8 * nside, dtype=np.int32),  # d8
+            np.arange(nside, 2 * nside, dtype=np.int32),  # a8
         ]
     )
     g_tilde = g_tilde[r]
 
-    h = h_ext_child - BD_inv @ h_int_child
-
-    # h is ordered like h_a_1, h_b_2, h_c_3, h_d_4. Need to
-    # roll it so that it's ordered like [bottom, left, right, top].
-    h = jnp.roll(h, -nside, axis=0)
+    # The exterior data is ordered like h_a_1, h_b_2, h_c_3, h_d_4. It is
+    # rolled so that it's ordered like [bottom, left, right, top]. The roll
+    # is folded into the gather indices.
+    roll = (np.arange(8 * nside, dtype=np.int32) + nside) % (8 * nside)
+    h = h_flat[idxes["ext"][roll]] - (BD_inv @ h_int_child)[roll]
 
     return h, g_tilde
 
@@ -0,0 +1,49 @@
+import functools
+from typing import Dict
+
+import numpy as np
+
+
+@functools.lru_cache
+def _child_bdry_idxes(nside: int) -> Dict[str, np.ndarray]:
+    """
+    Index arrays into the stacked boundary data of four children, which has
+    shape (16 * nside, ...) and is ordered a, b, c, d. Each child's boundary
+    is ordered [bottom, right, top, left]. The slices along the merge
+    interfaces go from OUTSIDE to INSIDE.
+
+    Args:
+        nside (int): Number of discretization points along each side of a child.
+
+    Returns:
+        Dict[str, np.ndarray]: Index arrays for each merge interface segment
+            (e.g. "a_5" is child a's part of interface 5), and "ext", the
+            concatenated exterior boundary ordered like h_a_1, h_b_2, h_c_3, h_d_4.
+    """
+    a, b, c, d = 0, 4 * nside, 8 * nside, 12 * nside
+
+    def seg(offset: int, start: int, stop: int) -> np.ndarray:
+        return np.arange(
+            offset + start * nside, offset + stop * nside, dtype=np.int32
+        )
+
+    idxes = {
+        "a_5": seg(a, 1, 2),
+        "a_8": seg(a, 2, 3)[::-1],
+        "b_6": seg(b, 2, 3),
+        "b_5": seg(b, 3, 4)[::-1],
+        "c_6": seg(c, 0, 1)[::-1],
+        "c_7": seg(c, 3, 4),
+        "d_8": seg(d, 0, 1),
+        "d_7": seg(d, 1, 2)[::-1],
+    }
+    idxes["ext"] = np.concatenate(
+        [
+            seg(a, 3, 4),  # a_1
+            seg(a, 0, 1),  # a_1
+            seg(b, 0, 2),  # b_2
+            seg(c, 1, 3),  # c_3
+            seg(d, 2, 4),  # d_4
+        ]
+    )
+    return idxes
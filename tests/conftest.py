@@ -0,0 +1,116 @@
+import os
+from types import SimpleNamespace
+
+# When the suite is run with pytest-xdist (e.g. ``pytest -n auto
+# --dist=loadfile``), share the cores between the workers in the BLAS
+# libraries used by NumPy instead of letting every worker start one BLAS
+# thread per core. XLA's own CPU thread pool is not limited here; the only
+# XLA setting applied turns off multithreading in Eigen-backed ops. This has
+# to happen before NumPy or JAX are imported.
+_n_workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+if _n_workers > 1:
+    _n_threads = str(max(1, (os.cpu_count() or 1) // _n_workers))
+    for _var in ("OPENBLAS_NUM_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(_var, _n_threads)
+    os.environ["XLA_FLAGS"] = " ".join(
+        [
+            os.environ.get("XLA_FLAGS", ""),
+            "--xla_cpu_multi_thread_eigen=false",
+        ]
+    ).strip()
+
+import jax
+import numpy as np
+import pytest
+
+from jaxhps._discretization_tree import (
+    DiscretizationNode2D,
+    DiscretizationNode3D,
+)
+from jaxhps._domain import Domain
+from jaxhps._pdeproblem import PDEProblem
+from jaxhps.local_solve._nosource_uniform_2D_ItI import (
+    nosource_local_solve_stage_uniform_2D_ItI,
+)
+from jaxhps.merge._nosource_uniform_2D_ItI import (
+    nosource_merge_stage_uniform_2D_ItI,
+)
+
+# Opt-in: with JAXHPS_TEST_JAX_CACHE=1, persist compiled XLA programs in
+# <repo>/.jax_cache between pytest runs. Most of the test suite's runtime is
+# compilation of small problems, and the same shapes are compiled on every
+# run. Settings the user already made through JAX's own environment variables
+# (including JAX_COMPILATION_CACHE_MAX_SIZE to bound the cache) are left
+# alone.
+if os.environ.get("JAXHPS_TEST_JAX_CACHE") == "1":
+    if "JAX_COMPILATION_CACHE_DIR" not in os.environ:
+        jax.config.update(
+            "jax_compilation_cache_dir",
+            os.path.join(
+                os.path.dirname(os.path.dirname(__file__)), ".jax_cache"
+            ),
+        )
+    # Small test problems compile quickly, so cache every program rather
+    # than only the ones taking longer than the default one second.
+    if "JAX_PERSISTENT_CACHE_MIN_COMPILE_TIME_SECS" not in os.environ:
+        jax.config.update("jax_persistent_cache_min_compile_time_secs", 0.0)
+
+
+@pytest.fixture(scope="session")
+def domain_2D_p6q4L2() -> Domain:
+    """Uniform 2D domain on the unit square with p=6, q=4, L=2. Shared by the
+    tests that use this discretization; Domain is not modified by any of the
+    solver stages."""
+    root = DiscretizationNode2D(xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0)
+    return Domain(p=6, q=4, root=root, L=2)
+
+
+@pytest.fixture(scope="session")
+def domain_3D_p6q4L2() -> Domain:
+    """Uniform 3D domain on the unit cube with p=6, q=4, L=2."""
+    root = DiscretizationNode3D(
+        xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0, zmin=0.0, zmax=1.0
+    )
+    return Domain(p=6, q=4, root=root, L=2)
+
+
+@pytest.fixture(scope="session")
+def nosource_ItI_p6q4L3() -> SimpleNamespace:
+    """Nosource ItI local solve and merge stages on a uniform 2D domain with
+    p=6, q=4, L=3 and eta=4.0. The PDEProblem has Y, Phi, D_inv_lst and
+    BD_inv_lst set, so it is ready for the upward pass. Tests should not
+    modify the returned arrays."""
+    l = 3
+    root = DiscretizationNode2D(xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0)
+    domain = Domain(p=6, q=4, root=root, L=l)
+    d_xx_coeffs = np.random.default_rng(0).standard_normal(
+        size=(domain.n_leaves, domain.p**2)
+    )
+    pde_problem = PDEProblem(
+        domain=domain,
+        D_xx_coefficients=d_xx_coeffs,
+        use_ItI=True,
+        eta=4.0,
+    )
+
+    Y_arr, T_arr, Phi_arr = nosource_local_solve_stage_uniform_2D_ItI(
+        pde_problem=pde_problem
+    )
+    S_arr_lst, D_inv_lst, BD_inv_lst = nosource_merge_stage_uniform_2D_ItI(
+        T_arr=T_arr, l=l
+    )
+    pde_problem.Y = Y_arr
+    pde_problem.Phi = Phi_arr
+    pde_problem.D_inv_lst = D_inv_lst
+    pde_problem.BD_inv_lst = BD_inv_lst
+
+    return SimpleNamespace(
+        pde_problem=pde_problem,
+        l=l,
+        Y_arr=Y_arr,
+        T_arr=T_arr,
+        Phi_arr=Phi_arr,
+        S_arr_lst=S_arr_lst,
+        D_inv_lst=D_inv_lst,
+        BD_inv_lst=BD_inv_lst,
+    )
@@ -1,3 +1,5 @@
+from typing import Callable
+
 import jax.numpy as jnp
 import jax
 
@@ -31,6 +33,39 @@ YMAX = jnp.pi / 2
 ETA = 1.0
 
 
+######################################################################
+# Helpers for evaluating expected boundary data
+def outward_normal_derivs(
+    dudx_fn: Callable, dudy_fn: Callable, boundary_points: jax.Array
+) -> jax.Array:
+    """Evaluates the outward normal derivative on the boundary of a square
+    domain, ordered [bottom, right, top, left]. Each callable is evaluated once
+    on all of the boundary points, and the per-side choice of derivative and
+    sign is applied by one compiled kernel."""
+    return _select_outward_normal(
+        dudx_fn(boundary_points), dudy_fn(boundary_points)
+    )
+
+
+@jax.jit
+def _select_outward_normal(
+    dudx_all: jax.Array, dudy_all: jax.Array
+) -> jax.Array:
+    # View the boundary data edge by edge, with shape (4, q, ...). The edges
+    # are [bottom, right, top, left] and the outward normals are
+    # -y, +x, +y, -x. The callables may return trailing singleton axes.
+    edge_shape = (4, -1) + dudx_all.shape[1:]
+    bcast = (4,) + (1,) * dudx_all.ndim
+    edge_signs = jnp.array([-1.0, 1.0, 1.0, -1.0]).reshape(bcast)
+    edge_uses_x = jnp.array([False, True, False, True]).reshape(bcast)
+    normals = edge_signs * jnp.where(
+        edge_uses_x,
+        dudx_all.reshape(edge_shape),
+        dudy_all.reshape(edge_shape),
+    )
+    return normals.reshape(dudx_all.shape)
+
+
 ######################################################################
 # Define coefficient and source functions that will be re-used
 def default_lap_coeffs(x: jnp.ndarray) -> jnp.ndarray:
@@ -15,6 +15,7 @@ from jaxhps.down_pass._uniform_2D_ItI import down_pass_uniform_2D_ItI
 # from jaxhps._utils import plot_soln_from_cheby_nodes
 
 from .cases import (
+    outward_normal_derivs,
     XMIN,
     XMAX,
     YMIN,
@@ -331,15 +332,9 @@ def check_merge_accuracy_2D_ItI_uniform_Helmholtz_like(
     # Compute the incoming impedance data
 
     # Assemble incoming impedance data
-    q = domain.boundary_points.shape[0] // 4
     boundary_u = test_case[K_SOLN](domain.boundary_points)
-    boundary_u_normals = jnp.concatenate(
-        [
-            -1 * test_case[K_DUDY](domain.boundary_points[:q]),
-            test_case[K_DUDX](domain.boundary_points[q : 2 * q]),
-            test_case[K_DUDY](domain.boundary_points[2 * q : 3 * q]),
-            -1 * test_case[K_DUDX](domain.boundary_points[3 * q :]),
-        ]
+    boundary_u_normals = outward_normal_derivs(
+        test_case[K_DUDX], test_case[K_DUDY], domain.boundary_points
     )
     incoming_imp_data = boundary_u_normals + 1j * pde_problem.eta * boundary_u
 
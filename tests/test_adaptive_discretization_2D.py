@@ -64,9 +64,11 @@ class Test_get_squared_l2_norm_single_panel:
 
         p = 4
 
-        f_evals = np.random.normal(size=(p**2))
+        f_evals = np.random.default_rng(0).standard_normal(p**2)
 
-        x = get_squared_l2_norm_single_panel(f_evals, node_to_bounds(root), p)
+        x = float(
+            get_squared_l2_norm_single_panel(f_evals, node_to_bounds(root), p)
+        )
 
         print("test_0: x: ", x)
         assert not np.isnan(x)
@@ -78,7 +80,9 @@ class Test_get_squared_l2_norm_single_panel:
         p = 4
 
         f_evals = 3 * np.ones((p**2))
-        x = get_squared_l2_norm_single_panel(f_evals, node_to_bounds(root), p)
+        x = float(
+            get_squared_l2_norm_single_panel(f_evals, node_to_bounds(root), p)
+        )
 
         print("test_1: x: ", x)
         assert np.isclose(x, 9.0)
@@ -96,7 +100,9 @@ class Test_get_squared_l2_norm_single_panel:
         cheby_pts = compute_interior_Chebyshev_points_adaptive_2D(root, p)
         f_evals = f(cheby_pts).flatten()
 
-        x = get_squared_l2_norm_single_panel(f_evals, node_to_bounds(root), p)
+        x = float(
+            get_squared_l2_norm_single_panel(f_evals, node_to_bounds(root), p)
+        )
 
         print("test_2: x: ", x)
 
@@ -114,7 +120,9 @@ class Test_get_squared_l2_norm_single_panel:
         p = 16
         f_evals = 3 * np.ones((p**2))
         expected_x = 9 * np.pi**2
-        x = get_squared_l2_norm_single_panel(f_evals, node_to_bounds(root), p)
+        x = float(
+            get_squared_l2_norm_single_panel(f_evals, node_to_bounds(root), p)
+        )
         print("test_3: x: ", x)
         print("test_3: expected_x: ", expected_x)
         assert np.isclose(x, expected_x)
@@ -401,3 +401,85 @@ class Test_build_solver:
 
         # g_tilde has shape n_bdry in the ItI case.
         assert pde_problem.S_lst[-1].shape == (1, n_bdry // 2, n_bdry)
+
+
+class Test_build_solver_chunked:
+    def test_0(self, caplog, monkeypatch) -> None:
+        """Uniform 2D DtN with the local solve stage split into chunks matches
+        the unchunked build."""
+        caplog.set_level(logging.DEBUG)
+        p = 6
+        q = 4
+        L = 2
+
+        root = DiscretizationNode2D(xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0)
+        domain = Domain(p=p, q=q, root=root, L=L)
+
+        d_xx_coeffs = jnp.array(
+            np.random.normal(size=domain.interior_points[..., 0].shape)
+        )
+        d_yy_coeffs = jnp.array(
+            np.random.normal(size=domain.interior_points[..., 0].shape)
+        )
+        source = jnp.array(
+            np.random.normal(size=domain.interior_points[..., 0].shape)
+        )
+
+        pde_problem = PDEProblem(
+            domain=domain,
+            D_xx_coefficients=d_xx_coeffs,
+            D_yy_coefficients=d_yy_coeffs,
+            source=source,
+        )
+        T_expected = build_solver(pde_problem, return_top_T=True)
+        Y_expected = pde_problem.Y
+        v_expected = pde_problem.v
+
+        # Force the chunked code path. 16 leaves in chunks of 4.
+        monkeypatch.setattr(
+            "jaxhps._build_solver.local_solve_chunksize_2D",
+            lambda p, dtype: 4,
+        )
+        T = build_solver(pde_problem, return_top_T=True)
+
+        assert jnp.allclose(T, T_expected)
+        assert jnp.allclose(pde_problem.Y, Y_expected)
+        assert jnp.allclose(pde_problem.v, v_expected)
+
+    def test_1(self, caplog, monkeypatch) -> None:
+        """Uniform 2D DtN with no source, with the local solve stage split
+        into chunks, matches the unchunked build."""
+        caplog.set_level(logging.DEBUG)
+        p = 6
+        q = 4
+        L = 2
+
+        root = DiscretizationNode2D(xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0)
+        domain = Domain(p=p, q=q, root=root, L=L)
+
+        d_xx_coeffs = jnp.array(
+            np.random.normal(size=domain.interior_points[..., 0].shape)
+        )
+        d_yy_coeffs = jnp.array(
+            np.random.normal(size=domain.interior_points[..., 0].shape)
+        )
+
+        pde_problem = PDEProblem(
+            domain=domain,
+            D_xx_coefficients=d_xx_coeffs,
+            D_yy_coefficients=d_yy_coeffs,
+        )
+        T_expected = build_solver(pde_problem, return_top_T=True)
+        Y_expected = pde_problem.Y
+        Phi_expected = pde_problem.Phi
+
+        # Force the chunked code path. 16 leaves in chunks of 4.
+        monkeypatch.setattr(
+            "jaxhps._build_solver.local_solve_chunksize_2D",
+            lambda p, dtype: 4,
+        )
+        T = build_solver(pde_problem, return_top_T=True)
+
+        assert jnp.allclose(T, T_expected)
+        assert jnp.allclose(pde_problem.Y, Y_expected)
+        assert jnp.allclose(pde_problem.Phi, Phi_expected)
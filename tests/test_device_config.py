@@ -0,0 +1,27 @@
+import jax.numpy as jnp
+import pytest
+
+from jaxhps._device_config import (
+    CHUNKSIZE_MULTIPLIER_ENV_VAR,
+    local_solve_chunksize_2D,
+)
+
+
+class Test_local_solve_chunksize_2D:
+    def test_0(self, monkeypatch) -> None:
+        """Checks the default chunksize is unchanged when the env var is unset."""
+        monkeypatch.delenv(CHUNKSIZE_MULTIPLIER_ENV_VAR, raising=False)
+        assert local_solve_chunksize_2D(16, jnp.float64) == 4**7
+        assert local_solve_chunksize_2D(16, jnp.complex128) == 4**6
+
+    def test_1(self, monkeypatch) -> None:
+        """Checks the env var scales the chunksize."""
+        monkeypatch.setenv(CHUNKSIZE_MULTIPLIER_ENV_VAR, "4")
+        assert local_solve_chunksize_2D(16, jnp.float64) == 4**8
+        assert local_solve_chunksize_2D(7, jnp.float64) == 4**3
+
+    def test_2(self, monkeypatch) -> None:
+        """Checks that multipliers which are not powers of four are rejected."""
+        monkeypatch.setenv(CHUNKSIZE_MULTIPLIER_ENV_VAR, "2")
+        with pytest.raises(ValueError):
+            local_solve_chunksize_2D(16, jnp.float64)
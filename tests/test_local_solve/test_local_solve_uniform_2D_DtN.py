@@ -71,6 +71,32 @@ class Test_assemble_diff_operator:
         assert out.shape == (p**2, p**2)
         jax.clear_caches()
 
+    def test_1(self) -> None:
+        """Checks the assembled operator against an explicit sum when the
+        coefficients are not contiguous."""
+        p = 8
+        half_side_len = 0.25
+
+        d_x, d_y, d_xx, d_yy, d_xy = precompute_diff_operators_2D(
+            p, half_side_len
+        )
+
+        stacked_diff_operators = jnp.stack(
+            [d_xx, d_xy, d_yy, d_x, d_y, jnp.eye(p**2)]
+        )
+        coeffs_arr = jnp.array(np.random.normal(size=(3, p**2)))
+        which_coeffs = jnp.array([False, True, False, True, False, True])
+        out = assemble_diff_operator(
+            coeffs_arr, which_coeffs, stacked_diff_operators
+        )
+        expected = (
+            jnp.diag(coeffs_arr[0]) @ d_xy
+            + jnp.diag(coeffs_arr[1]) @ d_x
+            + jnp.diag(coeffs_arr[2])
+        )
+        assert jnp.allclose(out, expected)
+        jax.clear_caches()
+
 
 class Test__local_solve_stage_2D:
     def test_0(self, caplog) -> None:
@@ -12,6 +12,9 @@ from jaxhps._discretization_tree import DiscretizationNode2D
 from jaxhps._domain import Domain
 from jaxhps._pdeproblem import PDEProblem
 
+# Shared, seeded generator so the random test data is reproducible.
+rng = np.random.default_rng(0)
+
 
 class Test_merge_stage_uniform_2D_ItI:
     def test_0(self) -> None:
@@ -30,10 +33,8 @@ class Test_merge_stage_uniform_2D_ItI:
         domain = Domain(p=p, q=q, root=root, L=l)
         n_leaves = 4**l
 
-        d_xx_coeffs = np.random.normal(size=(n_leaves, p**2))
-        source_term = np.random.normal(size=(n_leaves, p**2))
-        print("test_0: d_xx_coeffs = ", d_xx_coeffs.shape)
-        print("test_0: source_term = ", source_term.shape)
+        d_xx_coeffs = rng.standard_normal(size=(n_leaves, p**2))
+        source_term = rng.standard_normal(size=(n_leaves, p**2))
 
         t = PDEProblem(
             domain=domain,
@@ -55,17 +56,11 @@ class Test_merge_stage_uniform_2D_ItI:
         S_arr_lst, g_tilde_lst = merge_stage_uniform_2D_ItI(
             T_arr=T_arr, h_arr=h_arr, l=l
         )
-        print(
-            "test_0: S_arr_lst shapes = ", [S_arr.shape for S_arr in S_arr_lst]
-        )
 
         assert len(S_arr_lst) == l
         assert len(g_tilde_lst) == l
 
         for i in range(l):
-            print("test_0: i=", i)
-            print("test_0: S_arr_lst[i].shape = ", S_arr_lst[i].shape)
-            print("test_0: g_tilde_lst[i].shape = ", g_tilde_lst[i].shape)
             assert S_arr_lst[i].shape[-2] == g_tilde_lst[i].shape[-1]
 
         # Check the shapes of the bottom-level output arrays
@@ -102,10 +97,8 @@ class Test_merge_stage_uniform_2D_ItI:
         domain = Domain(p=p, q=q, root=root, L=l)
         n_leaves = 4**l
 
-        d_xx_coeffs = np.random.normal(size=(n_leaves, p**2))
-        source_term = np.random.normal(size=(n_leaves, p**2, n_src))
-        print("test_0: d_xx_coeffs = ", d_xx_coeffs.shape)
-        print("test_0: source_term = ", source_term.shape)
+        d_xx_coeffs = rng.standard_normal(size=(n_leaves, p**2))
+        source_term = rng.standard_normal(size=(n_leaves, p**2, n_src))
 
         t = PDEProblem(
             domain=domain,
@@ -127,17 +120,11 @@ class Test_merge_stage_uniform_2D_ItI:
         S_arr_lst, g_tilde_lst = merge_stage_uniform_2D_ItI(
             T_arr=T_arr, h_arr=h_arr, l=l
         )
-        print(
-            "test_0: S_arr_lst shapes = ", [S_arr.shape for S_arr in S_arr_lst]
-        )
 
         assert len(S_arr_lst) == l
         assert len(g_tilde_lst) == l
 
         for i in range(l):
-            print("test_0: i=", i)
-            print("test_0: S_arr_lst[i].shape = ", S_arr_lst[i].shape)
-            print("test_0: g_tilde_lst[i].shape = ", g_tilde_lst[i].shape)
             assert S_arr_lst[i].shape[-2] == g_tilde_lst[i].shape[-2]
 
         # Check the shapes of the bottom-level output arrays
@@ -163,16 +150,14 @@ class Test__uniform_quad_merge_ItI:
         n_bdry = 28
         n_bdry_int = n_bdry // 4
         n_bdry_ext = 2 * (n_bdry // 4)
-        T_a = np.random.normal(size=(n_bdry, n_bdry))
-        T_b = np.random.normal(size=(n_bdry, n_bdry))
-        T_c = np.random.normal(size=(n_bdry, n_bdry))
-        T_d = np.random.normal(size=(n_bdry, n_bdry))
-        v_prime_a = np.random.normal(size=(n_bdry))
-        v_prime_b = np.random.normal(size=(n_bdry))
-        v_prime_c = np.random.normal(size=(n_bdry))
-        v_prime_d = np.random.normal(size=(n_bdry))
-        print("test_0: T_a shape: ", T_a.shape)
-        print("test_0: v_prime_a shape: ", v_prime_a.shape)
+        T_a = rng.standard_normal(size=(n_bdry, n_bdry))
+        T_b = rng.standard_normal(size=(n_bdry, n_bdry))
+        T_c = rng.standard_normal(size=(n_bdry, n_bdry))
+        T_d = rng.standard_normal(size=(n_bdry, n_bdry))
+        v_prime_a = rng.standard_normal(size=(n_bdry))
+        v_prime_b = rng.standard_normal(size=(n_bdry))
+        v_prime_c = rng.standard_normal(size=(n_bdry))
+        v_prime_d = rng.standard_normal(size=(n_bdry))
         S, R, h, f = _uniform_quad_merge_ItI(
             T_a, T_b, T_c, T_d, v_prime_a, v_prime_b, v_prime_c, v_prime_d
         )
@@ -9,24 +9,12 @@ from jaxhps._domain import Domain
 
 
 class Test_PDEProblem_init:
-    def test_0(self) -> None:
+    def test_0(self, domain_2D_p6q4L2) -> None:
         """2D DtN initialization."""
 
-        # Create a 2D uniform domain
-        xmin = 0.0
-        xmax = 1.0
-        ymin = 0.0
-        ymax = 1.0
-        p = 6
-        q = 4
-        L = 2
-        root = DiscretizationNode2D(
-            xmin=xmin,
-            xmax=xmax,
-            ymin=ymin,
-            ymax=ymax,
-        )
-        domain = Domain(p=p, q=q, root=root, L=L)
+        domain = domain_2D_p6q4L2
+        p = domain.p
+        q = domain.q
 
         source = jnp.zeros_like(domain.interior_points[..., 0])
         D_xx_coefficients = jnp.zeros_like(domain.interior_points[..., 0])
@@ -40,24 +28,12 @@ class Test_PDEProblem_init:
         assert pde_problem.P.shape == (4 * (p - 1), 4 * q)
         assert pde_problem.Q.shape == (4 * q, p**2)
 
-    def test_1(self) -> None:
+    def test_1(self, domain_2D_p6q4L2) -> None:
         """2D ItI Initialization"""
 
-        # Create a 2D uniform domain
-        xmin = 0.0
-        xmax = 1.0
-        ymin = 0.0
-        ymax = 1.0
-        p = 6
-        q = 4
-        L = 2
-        root = DiscretizationNode2D(
-            xmin=xmin,
-            xmax=xmax,
-            ymin=ymin,
-            ymax=ymax,
-        )
-        domain = Domain(p=p, q=q, root=root, L=L)
+        domain = domain_2D_p6q4L2
+        p = domain.p
+        q = domain.q
 
         source = jnp.zeros_like(domain.interior_points[..., 0])
         D_xx_coefficients = jnp.zeros_like(domain.interior_points[..., 0])
@@ -195,3 +171,28 @@ class Test__get_PDEProblem_chunk:
         assert jnp.all(
             p_chunk.source == pde_problem.source[start_idx, end_idx]
         )
+
+    def test_1(self) -> None:
+        """Chunks share the stacked differential operators of the parent."""
+        p = 6
+        q = 4
+        L = 2
+        root = DiscretizationNode2D(xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0)
+        domain = Domain(p=p, q=q, root=root, L=L)
+
+        source = jnp.zeros_like(domain.interior_points[..., 0])
+        D_xx_coefficients = jnp.zeros_like(domain.interior_points[..., 0])
+
+        pde_problem = PDEProblem(
+            domain=domain, source=source, D_xx_coefficients=D_xx_coefficients
+        )
+        diff_ops = pde_problem._get_stacked_diff_ops()
+        assert diff_ops.shape == (6, p**2, p**2)
+        assert jnp.all(diff_ops[0] == pde_problem.D_xx)
+        assert jnp.all(diff_ops[5] == jnp.eye(p**2))
+
+        # The stack is built once and reused.
+        assert pde_problem._get_stacked_diff_ops() is diff_ops
+
+        p_chunk = _get_PDEProblem_chunk(pde_problem, 0, 3)
+        assert p_chunk._get_stacked_diff_ops() is diff_ops
@@ -14,30 +14,29 @@ from jaxhps._discretization_tree_operations_3D import add_eight_children
 
 from jaxhps._pdeproblem import PDEProblem
 
+# Shared, seeded generator so the random test data is reproducible.
+rng = np.random.default_rng(0)
+
+
+def _random_interior_data(domain: Domain) -> jax.Array:
+    """Standard normal samples at each of the domain's interior points."""
+    return jnp.array(
+        rng.standard_normal(size=domain.interior_points[..., 0].shape)
+    )
+
 
 class Test_solve:
-    def test_0(self, caplog) -> None:
+    def test_0(self, caplog, domain_2D_p6q4L2) -> None:
         """Uniform 2D DtN"""
         caplog.set_level(logging.DEBUG)
-        p = 6
-        q = 4
         L = 2
 
-        # Create a uniform 2D domain
-        root = DiscretizationNode2D(xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0)
+        domain = domain_2D_p6q4L2
 
-        domain = Domain(p=p, q=q, root=root, L=L)
+        d_xx_coeffs = _random_interior_data(domain)
 
-        d_xx_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
-
-        d_yy_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
-        source = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_yy_coeffs = _random_interior_data(domain)
+        source = _random_interior_data(domain)
 
         # Create a PDEProblem instance
         pde_problem = PDEProblem(
@@ -60,35 +59,24 @@ class Test_solve:
         assert pde_problem.g_tilde_lst[-1].shape == (1, n_bdry // 2)
 
         # Solve the problem
-        bdry_data = jnp.array(np.random.normal(size=n_bdry))
+        bdry_data = jnp.array(rng.standard_normal(size=n_bdry))
 
         solns = solve(pde_problem, bdry_data)
 
         assert solns.shape == (domain.interior_points[..., 0].shape)
         assert not isinstance(solns, jax.core.Tracer)
 
-    def test_1(self, caplog) -> None:
+    def test_1(self, caplog, domain_2D_p6q4L2) -> None:
         """Uniform 2D ItI"""
         caplog.set_level(logging.DEBUG)
-        p = 6
-        q = 4
         L = 2
 
-        # Create a uniform 2D domain
-        root = DiscretizationNode2D(xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0)
-
-        domain = Domain(p=p, q=q, root=root, L=L)
+        domain = domain_2D_p6q4L2
 
-        d_xx_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_xx_coeffs = _random_interior_data(domain)
 
-        d_yy_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
-        source = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_yy_coeffs = _random_interior_data(domain)
+        source = _random_interior_data(domain)
 
         # Create a PDEProblem instance
         pde_problem = PDEProblem(
@@ -113,37 +101,24 @@ class Test_solve:
         assert pde_problem.S_lst[-1].shape == (1, n_bdry, n_bdry)
         assert pde_problem.g_tilde_lst[-1].shape == (1, n_bdry)
         # Solve the problem
-        bdry_data = jnp.array(np.random.normal(size=n_bdry))
+        bdry_data = jnp.array(rng.standard_normal(size=n_bdry))
 
         solns = solve(pde_problem, bdry_data)
 
         assert solns.shape == (domain.interior_points[..., 0].shape)
         assert not isinstance(solns, jax.core.Tracer)
 
-    def test_2(self, caplog) -> None:
+    def test_2(self, caplog, domain_3D_p6q4L2) -> None:
         """Uniform 3D DtN"""
         caplog.set_level(logging.DEBUG)
-        p = 6
-        q = 4
         L = 2
 
-        # Create a uniform 2D domain
-        root = DiscretizationNode3D(
-            xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0, zmin=0.0, zmax=1.0
-        )
+        domain = domain_3D_p6q4L2
 
-        domain = Domain(p=p, q=q, root=root, L=L)
+        d_xx_coeffs = _random_interior_data(domain)
 
-        d_xx_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
-
-        d_yy_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
-        source = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_yy_coeffs = _random_interior_data(domain)
+        source = _random_interior_data(domain)
 
         # Create a PDEProblem instance
         pde_problem = PDEProblem(
@@ -170,7 +145,7 @@ class Test_solve:
         assert pde_problem.g_tilde_lst[-1].shape == (n_bdry // 2,)
 
         # Solve the problem
-        bdry_data = jnp.array(np.random.normal(size=n_bdry))
+        bdry_data = jnp.array(rng.standard_normal(size=n_bdry))
 
         solns = solve(pde_problem, bdry_data)
 
@@ -193,16 +168,10 @@ class Test_solve:
 
         domain = Domain(p=p, q=q, root=root)
 
-        d_xx_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_xx_coeffs = _random_interior_data(domain)
 
-        d_yy_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
-        source = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_yy_coeffs = _random_interior_data(domain)
+        source = _random_interior_data(domain)
 
         # Create a PDEProblem instance
         pde_problem = PDEProblem(
@@ -243,16 +212,10 @@ class Test_solve:
 
         domain = Domain(p=p, q=q, root=root)
 
-        d_xx_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_xx_coeffs = _random_interior_data(domain)
 
-        d_yy_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
-        source = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_yy_coeffs = _random_interior_data(domain)
+        source = _random_interior_data(domain)
 
         # Create a PDEProblem instance
         pde_problem = PDEProblem(
@@ -275,25 +238,16 @@ class Test_solve:
         solns = solve(pde_problem, bdry_data_lst)
         assert solns.shape == (domain.interior_points[..., 0].shape)
 
-    def test_5(self, caplog) -> None:
+    def test_5(self, caplog, domain_2D_p6q4L2) -> None:
         """Uniform 2D ItI with up and down passes"""
         caplog.set_level(logging.DEBUG)
-        p = 6
-        q = 4
         L = 2
 
-        # Create a uniform 2D domain
-        root = DiscretizationNode2D(xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0)
-
-        domain = Domain(p=p, q=q, root=root, L=L)
+        domain = domain_2D_p6q4L2
 
-        d_xx_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_xx_coeffs = _random_interior_data(domain)
 
-        d_yy_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_yy_coeffs = _random_interior_data(domain)
 
         # Create a PDEProblem instance
         pde_problem = PDEProblem(
@@ -315,45 +269,32 @@ class Test_solve:
         # g_tilde has shape n_bdry in the ItI case.
         assert pde_problem.S_lst[-1].shape == (1, n_bdry, n_bdry)
         # Solve the problem
-        bdry_data = jnp.array(np.random.normal(size=n_bdry))
+        bdry_data = jnp.array(rng.standard_normal(size=n_bdry))
 
-        source = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        source = _random_interior_data(domain)
 
         solns = solve(pde_problem, bdry_data, source=source)
         assert not isinstance(solns, jax.core.Tracer)
 
         assert solns.shape == (domain.interior_points[..., 0].shape)
 
-        source2 = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
-        bdry_data2 = jnp.array(np.random.normal(size=n_bdry))
+        source2 = _random_interior_data(domain)
+        bdry_data2 = jnp.array(rng.standard_normal(size=n_bdry))
 
         solns2 = solve(pde_problem, bdry_data2, source=source2)
         assert solns2.shape == (domain.interior_points[..., 0].shape)
         assert not isinstance(solns2, jax.core.Tracer)
 
-    def test_6(self, caplog) -> None:
+    def test_6(self, caplog, domain_2D_p6q4L2) -> None:
         """Uniform 2D DtN with up and down passes"""
         caplog.set_level(logging.DEBUG)
-        p = 6
-        q = 4
         L = 2
 
-        # Create a uniform 2D domain
-        root = DiscretizationNode2D(xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0)
+        domain = domain_2D_p6q4L2
 
-        domain = Domain(p=p, q=q, root=root, L=L)
-
-        d_xx_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_xx_coeffs = _random_interior_data(domain)
 
-        d_yy_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_yy_coeffs = _random_interior_data(domain)
 
         # Create a PDEProblem instance
         pde_problem = PDEProblem(
@@ -373,11 +314,9 @@ class Test_solve:
         # g_tilde has shape n_bdry in the ItI case.
         assert pde_problem.S_lst[-1].shape == (1, n_bdry // 2, n_bdry)
         # Solve the problem
-        bdry_data = jnp.array(np.random.normal(size=(n_bdry, 2)))
+        bdry_data = jnp.array(rng.standard_normal(size=(n_bdry, 2)))
 
-        source = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        source = _random_interior_data(domain)
 
         solns = solve(pde_problem, bdry_data, source=source)
         assert not isinstance(solns, jax.core.Tracer)
@@ -385,36 +324,27 @@ class Test_solve:
         assert solns.shape == (domain.interior_points.shape)
 
         source2 = jnp.array(
-            np.random.normal(size=domain.interior_points.shape)
+            rng.standard_normal(size=domain.interior_points.shape)
         )
-        bdry_data2 = jnp.array(np.random.normal(size=(n_bdry, 2)))
+        bdry_data2 = jnp.array(rng.standard_normal(size=(n_bdry, 2)))
 
         solns2 = solve(pde_problem, bdry_data2, source=source2)
         assert solns2.shape == (domain.interior_points.shape)
         assert not isinstance(solns2, jax.core.Tracer)
 
-    def test_7(self, caplog) -> None:
+    def test_7(self, caplog, domain_2D_p6q4L2) -> None:
         """Uniform 2D DtN with multiple sources"""
         caplog.set_level(logging.DEBUG)
-        p = 6
-        q = 4
         L = 2
         nsrc = 3
 
-        # Create a uniform 2D domain
-        root = DiscretizationNode2D(xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0)
+        domain = domain_2D_p6q4L2
 
-        domain = Domain(p=p, q=q, root=root, L=L)
+        d_xx_coeffs = _random_interior_data(domain)
 
-        d_xx_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
-
-        d_yy_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_yy_coeffs = _random_interior_data(domain)
         source = jnp.array(
-            np.random.normal(size=(domain.n_leaves, domain.p**2, nsrc))
+            rng.standard_normal(size=(domain.n_leaves, domain.p**2, nsrc))
         )
 
         # Create a PDEProblem instance
@@ -434,37 +364,26 @@ class Test_solve:
         assert pde_problem.S_lst[-1].shape == (1, n_bdry // 2, n_bdry)
 
         # Solve the problem
-        bdry_data = jnp.array(np.random.normal(size=(n_bdry, nsrc)))
+        bdry_data = jnp.array(rng.standard_normal(size=(n_bdry, nsrc)))
 
         solns = solve(pde_problem, bdry_data, source=source)
 
         assert solns.shape == source.shape
         assert not isinstance(solns, jax.core.Tracer)
 
-    def test_8(self, caplog) -> None:
+    def test_8(self, caplog, domain_3D_p6q4L2) -> None:
         """Uniform 3D DtN with multiple sources"""
         caplog.set_level(logging.DEBUG)
-        p = 6
-        q = 4
         L = 2
         nsrc = 2
 
-        # Create a uniform 2D domain
-        root = DiscretizationNode3D(
-            xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0, zmin=0.0, zmax=1.0
-        )
-
-        domain = Domain(p=p, q=q, root=root, L=L)
+        domain = domain_3D_p6q4L2
 
-        d_xx_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_xx_coeffs = _random_interior_data(domain)
 
-        d_yy_coeffs = jnp.array(
-            np.random.normal(size=domain.interior_points[..., 0].shape)
-        )
+        d_yy_coeffs = _random_interior_data(domain)
         source = jnp.array(
-            np.random.normal(size=(domain.n_leaves, domain.p**3, nsrc))
+            rng.standard_normal(size=(domain.n_leaves, domain.p**3, nsrc))
         )
         logging.debug("Source shape: %s", source.shape)
 
@@ -493,7 +412,7 @@ class Test_solve:
         assert pde_problem.g_tilde_lst[-1].shape == (n_bdry // 2, nsrc)
 
         # Solve the problem
-        bdry_data = jnp.array(np.random.normal(size=(n_bdry, nsrc)))
+        bdry_data = jnp.array(rng.standard_normal(size=(n_bdry, nsrc)))
 
         solns = solve(pde_problem, bdry_data)
 
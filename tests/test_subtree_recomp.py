@@ -9,7 +9,10 @@ from jaxhps._pdeproblem import PDEProblem
 from jaxhps._subtree_recomp import (
     upward_pass_subtree,
     downward_pass_subtree,
+    solve_subtree,
 )
+from jaxhps._build_solver import build_solver
+from jaxhps._solve import solve
 
 import logging
 
@@ -220,3 +223,75 @@ class Test_downward_pass_subtree:
         solns = downward_pass_subtree(t, g, subtree_height=2)
 
         assert solns.shape == (domain.n_leaves, p**2, nsrc)
+
+
+class Test_solve_subtree:
+    def test_0(self, caplog) -> None:
+        """DtN case. p=7 forces the recomputation branch."""
+        caplog.set_level(logging.DEBUG)
+        p = 7
+        q = 5
+        l = 3
+        num_leaves = 4**l
+        root = DiscretizationNode2D(xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0)
+        domain = Domain(p=p, q=q, root=root, L=l)
+
+        d_xx_coeffs = jnp.array(np.random.normal(size=(num_leaves, p**2)))
+        source_term = jnp.array(np.random.normal(size=(num_leaves, p**2)))
+        n_bdry = domain.boundary_points.shape[0]
+        g = jnp.array(np.random.normal(size=(n_bdry,)))
+
+        t = PDEProblem(
+            domain=domain,
+            source=source_term,
+            D_xx_coefficients=d_xx_coeffs,
+        )
+        build_solver(t)
+        expected_solns = solve(t, g)
+
+        t = PDEProblem(
+            domain=domain,
+            source=source_term,
+            D_xx_coefficients=d_xx_coeffs,
+        )
+        solns = solve_subtree(t, g, subtree_height=2)
+
+        assert solns.shape == domain.interior_points[..., 0].shape
+        assert jnp.allclose(solns, expected_solns)
+
+    def test_1(self, caplog) -> None:
+        """ItI case. p=7 forces the recomputation branch."""
+        caplog.set_level(logging.DEBUG)
+        p = 7
+        q = 5
+        l = 3
+        num_leaves = 4**l
+        root = DiscretizationNode2D(xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0)
+        domain = Domain(p=p, q=q, root=root, L=l)
+
+        d_xx_coeffs = jnp.array(np.random.normal(size=(num_leaves, p**2)))
+        source_term = jnp.array(np.random.normal(size=(num_leaves, p**2)))
+        n_bdry = domain.boundary_points.shape[0]
+        g = jnp.array(np.random.normal(size=(n_bdry,)) + 0j)
+
+        t = PDEProblem(
+            domain=domain,
+            source=source_term,
+            D_xx_coefficients=d_xx_coeffs,
+            use_ItI=True,
+            eta=1.0,
+        )
+        build_solver(t)
+        expected_solns = solve(t, g)
+
+        t = PDEProblem(
+            domain=domain,
+            source=source_term,
+            D_xx_coefficients=d_xx_coeffs,
+            use_ItI=True,
+            eta=1.0,
+        )
+        solns = solve_subtree(t, g, subtree_height=2)
+
+        assert solns.shape == domain.interior_points[..., 0].shape
+        assert jnp.allclose(solns, expected_solns)
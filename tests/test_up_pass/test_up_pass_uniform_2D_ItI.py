@@ -17,6 +17,9 @@ from jaxhps.local_solve._nosource_uniform_2D_ItI import (
 )
 import logging
 
+# Shared, seeded generator so the random test data is reproducible.
+rng = np.random.default_rng(0)
+
 
 class Test_assemble_boundary_data:
     def test_0(self, caplog) -> None:
@@ -33,59 +36,16 @@ class Test_assemble_boundary_data:
 
 
 class Test_up_pass_uniform_2D_ItI:
-    def test_0(self, caplog) -> None:
+    def test_0(self, caplog, nosource_ItI_p6q4L3) -> None:
         """Tests to make sure things run without error."""
         caplog.set_level(logging.DEBUG)
         p = 6
-        q = 4
         l = 3
-        eta = 4.0
 
-        root = DiscretizationNode2D(
-            xmin=0.0,
-            xmax=1.0,
-            ymin=0.0,
-            ymax=1.0,
-        )
-        domain = Domain(p=p, q=q, root=root, L=l)
+        t = nosource_ItI_p6q4L3.pde_problem
+        domain = t.domain
         n_leaves = 4**l
 
-        d_xx_coeffs = np.random.normal(size=(n_leaves, p**2))
-        print("test_0: d_xx_coeffs = ", d_xx_coeffs.shape)
-
-        t = PDEProblem(
-            domain=domain,
-            D_xx_coefficients=d_xx_coeffs,
-            use_ItI=True,
-            eta=eta,
-        )
-
-        Y_arr, T_arr, Phi_arr = nosource_local_solve_stage_uniform_2D_ItI(
-            pde_problem=t
-        )
-        t.Y = Y_arr
-        # t.T = T_arr
-        t.Phi = Phi_arr
-
-        assert Y_arr.shape == (n_leaves, p**2, 4 * q)
-        # n_leaves, n_bdry, _ = DtN_arr.shape
-        # DtN_arr = DtN_arr.reshape((int(n_leaves / 2), 2, n_bdry, n_bdry))
-        # v_prime_arr = v_prime_arr.reshape((int(n_leaves / 2), 2, 4 * t.q))
-
-        S_arr_lst, D_inv_lst, BD_inv_lst = nosource_merge_stage_uniform_2D_ItI(
-            T_arr=T_arr, l=l
-        )
-
-        t.D_inv_lst = D_inv_lst
-        t.BD_inv_lst = BD_inv_lst
-
-        logging.debug(
-            "test_0: D_inv_lst shapes = %s", [s.shape for s in D_inv_lst]
-        )
-        logging.debug(
-            "test_0: BD_inv_lst shapes = %s", [s.shape for s in BD_inv_lst]
-        )
-
         source = jnp.ones_like(domain.interior_points[..., 0])
 
         # Do the upward pass
@@ -97,60 +57,17 @@ class Test_up_pass_uniform_2D_ItI:
         assert v.shape == (n_leaves, p**2)
         assert len(g_tilde_lst) == l
 
-    def test_1(self, caplog) -> None:
+    def test_1(self, caplog, nosource_ItI_p6q4L3) -> None:
         """Tests to make sure things run without error. nsrc=3."""
         caplog.set_level(logging.DEBUG)
         p = 6
-        q = 4
         l = 3
-        eta = 4.0
         nsrc = 3
 
-        root = DiscretizationNode2D(
-            xmin=0.0,
-            xmax=1.0,
-            ymin=0.0,
-            ymax=1.0,
-        )
-        domain = Domain(p=p, q=q, root=root, L=l)
+        t = nosource_ItI_p6q4L3.pde_problem
+        domain = t.domain
         n_leaves = 4**l
 
-        d_xx_coeffs = np.random.normal(size=(n_leaves, p**2))
-        print("test_0: d_xx_coeffs = ", d_xx_coeffs.shape)
-
-        t = PDEProblem(
-            domain=domain,
-            D_xx_coefficients=d_xx_coeffs,
-            use_ItI=True,
-            eta=eta,
-        )
-
-        Y_arr, T_arr, Phi_arr = nosource_local_solve_stage_uniform_2D_ItI(
-            pde_problem=t
-        )
-
-        t.Y = Y_arr
-        t.Phi = Phi_arr
-
-        assert Y_arr.shape == (n_leaves, p**2, 4 * q)
-        # n_leaves, n_bdry, _ = DtN_arr.shape
-        # DtN_arr = DtN_arr.reshape((int(n_leaves / 2), 2, n_bdry, n_bdry))
-        # v_prime_arr = v_prime_arr.reshape((int(n_leaves / 2), 2, 4 * t.q))
-
-        S_arr_lst, D_inv_lst, BD_inv_lst = nosource_merge_stage_uniform_2D_ItI(
-            T_arr=T_arr, l=l
-        )
-
-        t.D_inv_lst = D_inv_lst
-        t.BD_inv_lst = BD_inv_lst
-
-        logging.debug(
-            "test_0: D_inv_lst shapes = %s", [s.shape for s in D_inv_lst]
-        )
-        logging.debug(
-            "test_0: BD_inv_lst shapes = %s", [s.shape for s in BD_inv_lst]
-        )
-
         source = jnp.ones((domain.n_leaves, p**2, nsrc))
 
         # Do the upward pass
@@ -162,79 +79,56 @@ class Test_up_pass_uniform_2D_ItI:
         assert v.shape == (n_leaves, p**2, nsrc)
         assert len(g_tilde_lst) == l
 
-    def test_2(self, caplog) -> None:
+    def test_2(self, caplog, nosource_ItI_p6q4L3) -> None:
         """Tests to make sure things run without error. nsrc=3 and return_h_last = True"""
         caplog.set_level(logging.DEBUG)
         p = 6
-        q = 4
         l = 3
-        eta = 4.0
         nsrc = 3
 
-        root = DiscretizationNode2D(
-            xmin=0.0,
-            xmax=1.0,
-            ymin=0.0,
-            ymax=1.0,
-        )
-        domain = Domain(p=p, q=q, root=root, L=l)
+        t = nosource_ItI_p6q4L3.pde_problem
+        domain = t.domain
         n_leaves = 4**l
 
-        d_xx_coeffs = np.random.normal(size=(n_leaves, p**2))
-        print("test_0: d_xx_coeffs = ", d_xx_coeffs.shape)
-
-        t = PDEProblem(
-            domain=domain,
-            D_xx_coefficients=d_xx_coeffs,
-            use_ItI=True,
-            eta=eta,
-        )
+        source = jnp.ones((domain.n_leaves, p**2, nsrc))
 
-        Y_arr, T_arr, Phi_arr = nosource_local_solve_stage_uniform_2D_ItI(
-            pde_problem=t
+        # Do the upward pass
+        v, g_tilde_lst, h_last = up_pass_uniform_2D_ItI(
+            source=source, pde_problem=t, return_h_last=True
         )
 
-        t.Y = Y_arr
-        # t.T = T_arr
-        t.Phi = Phi_arr
-
-        assert Y_arr.shape == (n_leaves, p**2, 4 * q)
-        # n_leaves, n_bdry, _ = DtN_arr.shape
-        # DtN_arr = DtN_arr.reshape((int(n_leaves / 2), 2, n_bdry, n_bdry))
-        # v_prime_arr = v_prime_arr.reshape((int(n_leaves / 2), 2, 4 * t.q))
-
-        S_arr_lst, D_inv_lst, BD_inv_lst = nosource_merge_stage_uniform_2D_ItI(
-            T_arr=T_arr, l=l
-        )
+        assert v.shape == (n_leaves, p**2, nsrc)
+        assert len(g_tilde_lst) == l
+        assert h_last.shape == (domain.boundary_points.shape[0], nsrc)
 
-        t.D_inv_lst = D_inv_lst
-        t.BD_inv_lst = BD_inv_lst
+    def test_3(self, caplog, nosource_ItI_p6q4L3) -> None:
+        """Tests to make sure things run without error. nsrc=1 and return_h_last = True"""
+        caplog.set_level(logging.DEBUG)
+        p = 6
+        l = 3
 
-        logging.debug(
-            "test_0: D_inv_lst shapes = %s", [s.shape for s in D_inv_lst]
-        )
-        logging.debug(
-            "test_0: BD_inv_lst shapes = %s", [s.shape for s in BD_inv_lst]
-        )
+        t = nosource_ItI_p6q4L3.pde_problem
+        domain = t.domain
+        n_leaves = 4**l
 
-        source = jnp.ones((domain.n_leaves, p**2, nsrc))
+        source = jnp.ones((domain.n_leaves, p**2))
 
         # Do the upward pass
         v, g_tilde_lst, h_last = up_pass_uniform_2D_ItI(
             source=source, pde_problem=t, return_h_last=True
         )
 
-        assert v.shape == (n_leaves, p**2, nsrc)
+        assert v.shape == (n_leaves, p**2)
         assert len(g_tilde_lst) == l
-        assert h_last.shape == (domain.boundary_points.shape[0], nsrc)
+        assert h_last.shape == (domain.boundary_points.shape[0],)
 
-    def test_3(self, caplog) -> None:
-        """Tests to make sure things run without error. nsrc=1 and return_h_last = True"""
-        caplog.set_level(logging.DEBUG)
+    def test_4(self, monkeypatch) -> None:
+        """Checks that splitting the sources into chunks gives the same answer as a single chunk."""
         p = 6
         q = 4
-        l = 3
+        l = 2
         eta = 4.0
+        nsrc = 5
 
         root = DiscretizationNode2D(
             xmin=0.0,
@@ -245,8 +139,7 @@ class Test_up_pass_uniform_2D_ItI:
         domain = Domain(p=p, q=q, root=root, L=l)
         n_leaves = 4**l
 
-        d_xx_coeffs = np.random.normal(size=(n_leaves, p**2))
-        print("test_0: d_xx_coeffs = ", d_xx_coeffs.shape)
+        d_xx_coeffs = rng.standard_normal(size=(n_leaves, p**2))
 
         t = PDEProblem(
             domain=domain,
@@ -258,36 +151,32 @@ class Test_up_pass_uniform_2D_ItI:
         Y_arr, T_arr, Phi_arr = nosource_local_solve_stage_uniform_2D_ItI(
             pde_problem=t
         )
-
         t.Y = Y_arr
         t.Phi = Phi_arr
 
-        assert Y_arr.shape == (n_leaves, p**2, 4 * q)
-        # n_leaves, n_bdry, _ = DtN_arr.shape
-        # DtN_arr = DtN_arr.reshape((int(n_leaves / 2), 2, n_bdry, n_bdry))
-        # v_prime_arr = v_prime_arr.reshape((int(n_leaves / 2), 2, 4 * t.q))
-
         S_arr_lst, D_inv_lst, BD_inv_lst = nosource_merge_stage_uniform_2D_ItI(
             T_arr=T_arr, l=l
         )
-
         t.D_inv_lst = D_inv_lst
         t.BD_inv_lst = BD_inv_lst
 
-        logging.debug(
-            "test_0: D_inv_lst shapes = %s", [s.shape for s in D_inv_lst]
-        )
-        logging.debug(
-            "test_0: BD_inv_lst shapes = %s", [s.shape for s in BD_inv_lst]
-        )
-
-        source = jnp.ones((domain.n_leaves, p**2))
+        # The source is left on the host, since sources that are already on
+        # the device are not split into chunks.
+        source = rng.standard_normal(size=(n_leaves, p**2, nsrc))
 
-        # Do the upward pass
         v, g_tilde_lst, h_last = up_pass_uniform_2D_ItI(
             source=source, pde_problem=t, return_h_last=True
         )
 
-        assert v.shape == (n_leaves, p**2)
-        assert len(g_tilde_lst) == l
-        assert h_last.shape == (domain.boundary_points.shape[0],)
+        monkeypatch.setattr(
+            "jaxhps.up_pass._uniform_2D_ItI.UP_PASS_SRC_CHUNKSIZE", 2
+        )
+        v_c, g_tilde_lst_c, h_last_c = up_pass_uniform_2D_ItI(
+            source=source, pde_problem=t, return_h_last=True
+        )
+
+        assert jnp.allclose(v, v_c)
+        assert len(g_tilde_lst_c) == l
+        for g, g_c in zip(g_tilde_lst, g_tilde_lst_c):
+            assert jnp.allclose(g, g_c)
+        assert jnp.allclose(h_last, h_last_c)